@@ -7,6 +7,23 @@ import time
 import math
 import pprint
 import ctypes
+import types
+import gc
+import json
+import collections
+import itertools
+import queue
+import socketserver
+import re
+import traceback
+import cProfile
+import pstats
+import marshal
+import tracemalloc
+import secrets
+import hmac
+import tkinter
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 
 # --- PATH SETUP ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,39 +32,34 @@ if os.path.exists(LIB_DIR) and LIB_DIR not in sys.path:
     sys.path.insert(0, LIB_DIR)
 
 import customtkinter
+import minescript_ui
+from minescript_ui import compile_params
 
 try:
     import minescript
 except ImportError:
+    # Outside the game: run against the offline simulator so scripts still work
+    from minescript_sim import SimMinescript
 
-    class MockMinescript:
-        class EventType:
-            KEY = "key"
-
-        def echo(self, msg):
-            print(f"[MINESCRIPT] {msg}")
-
-        def execute(self, cmd):
-            print(f"[EXEC] {cmd}")
-
-        class EventQueue:
-            def register_key_listener(self):
-                pass
-
-            def get(self, block=False):
-                return None
-
-        def screen_name(self):
-            return None
-
-    minescript = MockMinescript()
+    minescript = SimMinescript()
+    sys.modules["minescript"] = minescript
 
 # --- CONFIG MANAGEMENT ---
 DEFAULT_CFG = {
     "key_toggle": 344,  # R-Shift
     "shortcuts": {},  # { key_code: "script_name" }
+    "max_resident_modules": 32,  # 0 = unlimited
+    "max_resident_kb": 16384,  # 0 = unlimited
+    "control_port": 0,  # Loopback control API (e.g. 47823), 0 = disabled
+    "pipelines": {},  # { name: [{"script", "params", "continue_on_error"}] }
+    "command_rate_min": 2,  # Commands/s the governor never goes below
+    "command_rate_max": 40,  # Commands/s ceiling, 0 = governor disabled
+    "stall_threshold_ms": 500,  # Main-loop stall detection, 0 = disabled
+    "memory_tracking": False,  # tracemalloc snapshots around each run
 }
 
+PIPELINE_PREFIX = "pipeline:"  # Shortcut/active ids for pipelines
+
 CONFIG_PATH = os.path.join(BASE_DIR, "gui_config.py")
 
 
@@ -125,6 +137,784 @@ def keycode_to_name(keycode):
     return mapping.get(keycode, f"Key {keycode}")
 
 
+# --- MODULE RESIDENCY ---
+SIZE_SAMPLE = 32  # Items walked per container; the rest is extrapolated
+SIZE_MAX_NODES = 5000  # Past this many objects, only shallow sizes are counted
+
+
+def approx_size(obj, seen=None, depth=0):
+    """Rough deep size of an object graph.
+
+    Walks at most SIZE_SAMPLE items of each container and SIZE_MAX_NODES
+    objects in total, so large caches cost about as much to measure as small ones.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or depth > 6 or isinstance(obj, types.ModuleType):
+        return 0
+    size = sys.getsizeof(obj, 0)
+    if len(seen) >= SIZE_MAX_NODES:
+        return size
+    seen.add(id(obj))
+
+    if isinstance(obj, dict):
+        sample = list(itertools.islice(obj.items(), SIZE_SAMPLE))
+        walked = sum(
+            approx_size(k, seen, depth + 1) + approx_size(v, seen, depth + 1)
+            for k, v in sample
+        )
+        size += walked * len(obj) // len(sample) if sample else 0
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        sample = list(itertools.islice(obj, SIZE_SAMPLE))
+        walked = sum(approx_size(item, seen, depth + 1) for item in sample)
+        size += walked * len(obj) // len(sample) if sample else 0
+    elif isinstance(obj, types.FunctionType):
+        size += approx_size(obj.__code__, seen, depth + 1)
+        size += approx_size(obj.__defaults__, seen, depth + 1)
+    elif isinstance(obj, types.CodeType):
+        size += approx_size(obj.co_consts, seen, depth + 1)
+        size += sys.getsizeof(obj.co_code, 0)
+    elif isinstance(obj, type):
+        size += approx_size(dict(vars(obj)), seen, depth + 1)
+    elif hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), seen, depth + 1)
+    return size
+
+
+def module_size(mod):
+    """Approximate memory held by a module's own globals."""
+    seen = set()
+    return sum(
+        approx_size(v, seen)
+        for k, v in vars(mod).items()
+        if k != "__builtins__"
+    )
+
+
+class ModuleResidency:
+    """Keeps script modules imported on demand and evicts the least recently used ones.
+
+    Scripts are imported once at startup to read their UI_CONFIG. Past the
+    configured count/memory budget, idle modules are dropped from sys.modules
+    (together with helper modules they pulled in from the scripts folder) and
+    meta["module"] is cleared. acquire() re-imports them transparently.
+    """
+
+    def __init__(self, scripts_dir, max_modules=0, max_kb=0):
+        self.scripts_dir = os.path.normcase(os.path.abspath(scripts_dir))
+        self.max_modules = max_modules
+        self.max_kb = max_kb
+        self.lock = threading.RLock()
+        self.entries = {}  # { module_name: {"meta", "last_used", "size", "deps"} }
+        self.pinned = collections.Counter()  # { module_name: active pins }
+
+    def _owns(self, mod):
+        path = getattr(mod, "__file__", None)
+        if not path:
+            return False
+        return os.path.normcase(os.path.abspath(path)).startswith(self.scripts_dir + os.sep)
+
+    def local_imports(self, mod):
+        """Names of modules from the scripts folder that `mod` uses, directly or transitively.
+
+        Found by inspecting module globals (imported modules, and the defining
+        module of from-imported objects), so helpers shared by several scripts
+        are recorded for each of them.
+        """
+        found = set()
+        pending = [mod]
+        while pending:
+            current = pending.pop()
+            for value in list(vars(current).values()):
+                if isinstance(value, types.ModuleType):
+                    dep = value
+                else:
+                    name = getattr(value, "__module__", None)
+                    dep = sys.modules.get(name) if isinstance(name, str) else None
+                if dep is None or dep is mod or not self._owns(dep):
+                    continue
+                if dep.__name__ not in found:
+                    found.add(dep.__name__)
+                    pending.append(dep)
+        return sorted(found)
+
+    def import_script(self, module_name):
+        """Imports (or reloads) a script module and records its local dependencies."""
+        with self.lock:
+            if module_name in sys.modules:
+                mod = importlib.reload(sys.modules[module_name])
+            else:
+                mod = importlib.import_module(module_name)
+            return mod, self.local_imports(mod)
+
+    def admit(self, meta, mod, deps=()):
+        with self.lock:
+            meta["module"] = mod
+            self.entries[meta["id"]] = {
+                "meta": meta,
+                "last_used": time.monotonic(),
+                "size": module_size(mod),
+                "deps": list(deps),
+            }
+
+    def acquire(self, meta):
+        """Returns the module for meta, re-importing it if it was evicted."""
+        with self.lock:
+            mod = meta.get("module")
+            if mod is None:
+                mod, deps = self.import_script(meta["id"])
+                self.admit(meta, mod, deps)
+            elif meta["id"] not in self.entries:
+                self.admit(meta, mod)
+            else:
+                self.entries[meta["id"]]["last_used"] = time.monotonic()
+            return mod
+
+    def pin(self, script_id):
+        """Protects a module from eviction. Pins are counted; each needs a release()."""
+        with self.lock:
+            self.pinned[script_id] += 1
+
+    def release(self, script_id):
+        """Drops one pin after a run and refreshes the module's size estimate."""
+        with self.lock:
+            if self.pinned[script_id] > 1:
+                self.pinned[script_id] -= 1
+            else:
+                self.pinned.pop(script_id, None)
+            entry = self.entries.get(script_id)
+            mod = entry and entry["meta"].get("module")
+            if mod is not None:
+                entry["last_used"] = time.monotonic()
+                entry["size"] = module_size(mod)
+        self.enforce_budget()
+
+    def evict(self, script_id):
+        with self.lock:
+            entry = self.entries.pop(script_id, None)
+            if entry is None:
+                return
+            entry["meta"]["module"] = None
+            still_needed = set(self.entries)
+            for other in self.entries.values():
+                still_needed.update(other["deps"])
+            for name in [script_id] + entry["deps"]:
+                if name not in still_needed:
+                    sys.modules.pop(name, None)
+
+    def enforce_budget(self):
+        evicted = 0
+        with self.lock:
+            idle = sorted(
+                (e["last_used"], name)
+                for name, e in self.entries.items()
+                if name not in self.pinned
+            )
+            for _, name in idle:
+                count, total = self.stats()
+                over_count = self.max_modules and count > self.max_modules
+                over_memory = self.max_kb and total > self.max_kb * 1024
+                if not (over_count or over_memory):
+                    break
+                self.evict(name)
+                evicted += 1
+        if evicted:
+            gc.collect()
+        return evicted
+
+    def files(self, script_id):
+        """Source files of a resident script and its local helper modules."""
+        with self.lock:
+            entry = self.entries.get(script_id)
+            if entry is None:
+                return []
+            mods = [entry["meta"].get("module")]
+            mods += [sys.modules.get(name) for name in entry["deps"]]
+            return [m.__file__ for m in mods if m is not None and getattr(m, "__file__", None)]
+
+    def forget_missing(self, live_ids):
+        """Drops entries for scripts that no longer exist on disk."""
+        with self.lock:
+            for name in list(self.entries):
+                if name not in live_ids:
+                    self.evict(name)
+
+    def stats(self):
+        """Returns (resident module count, approximate bytes)."""
+        with self.lock:
+            total = sum(e["size"] for e in self.entries.values())
+            return len(self.entries), total
+
+
+
+# --- GAME EVENTS ---
+# Event type -> EventQueue method that registers its listener
+EVENT_LISTENERS = {
+    "key": "register_key_listener",
+    "mouse": "register_mouse_listener",
+    "chat": "register_chat_listener",
+    "outgoing_chat": "register_outgoing_chat_listener",
+    "add_entity": "register_add_entity_listener",
+    "block_update": "register_block_update_listener",
+    "take_item": "register_take_item_listener",
+    "damage": "register_damage_listener",
+    "explosion": "register_explosion_listener",
+    "chunk": "register_chunk_listener",
+    "world": "register_world_listener",
+}
+TICK_INTERVAL = 0.05  # Synthetic "tick" events, 20 per second
+MAILBOX_INTERVAL = 0.1  # Seconds between UI mailbox drains
+
+
+# --- COMMAND GOVERNOR ---
+# Chat messages that mean the server thinks we are sending too much
+# Only warnings addressed to this client: they start (after any [tags]) with the
+# kick text, "slow down" or "you ...", so "Bob was kicked for spamming" is ignored
+THROTTLE_PATTERNS = re.compile(
+    r"^\s*(\[[^\]]*\]\s*)*"
+    r"(kicked for spamming"
+    r"|(please\s+)?slow down"
+    r"|(you|you're|you are)\b.*\b(too fast|too quickly|too many|rate.?limit)"
+    r"|(you('re| are| have been| were) )?rate.?limited)",
+    re.IGNORECASE,
+)
+# Player chat ("<Name> ...", optionally behind [rank] tags) is never a throttle signal
+PLAYER_CHAT = re.compile(r"^\s*(\[[^\]]*\]\s*)*<[^>]+>")
+
+
+class CommandGovernor:
+    """Shared, adaptive token bucket in front of minescript.execute.
+
+    Every running script draws from the same rate, split evenly between the
+    scripts that sent a command recently. The rate backs off multiplicatively
+    on errors, slow calls or throttle messages in chat, and creeps back up
+    while calls stay healthy (AIMD).
+    """
+
+    ACTIVE_WINDOW = 2.0  # Seconds a script counts as active after its last command
+    LAG_THRESHOLD = 0.25  # Seconds; slower execute() calls count as lag
+    HEALTHY_STREAK = 20  # Healthy calls before the rate is raised
+    RATE_STEP = 1.0
+
+    def __init__(self, min_rate, max_rate):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = max(min_rate, max_rate / 2)
+        self.lock = threading.Lock()
+        self.buckets = {}  # { script_id: [tokens, last_refill, last_used] }
+        self.healthy = 0
+        self.sent = collections.deque()  # Timestamps of recent commands
+        self.backoffs = 0
+
+    def _share(self, now):
+        active = sum(
+            1 for b in self.buckets.values() if now - b[2] < self.ACTIVE_WINDOW
+        )
+        return self.rate / max(active, 1)
+
+    def acquire(self, script_id):
+        """Blocks the calling thread until this script may send a command."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                bucket = self.buckets.get(script_id)
+                if bucket is None:
+                    bucket = self.buckets[script_id] = [1.0, now, now]
+                bucket[2] = now
+                share = self._share(now)
+                burst = max(1.0, share)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * share)
+                bucket[1] = now
+                if bucket[0] >= 1.0:
+                    bucket[0] -= 1.0
+                    self.sent.append(now)
+                    return
+                wait = (1.0 - bucket[0]) / share
+            time.sleep(wait)
+
+    def _backoff(self, factor):
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.healthy = 0
+        self.backoffs += 1
+
+    def record(self, latency, error=False):
+        with self.lock:
+            if error:
+                self._backoff(0.5)
+            elif latency > self.LAG_THRESHOLD:
+                self._backoff(0.8)
+            else:
+                self.healthy += 1
+                if self.healthy >= self.HEALTHY_STREAK:
+                    self.healthy = 0
+                    self.rate = min(self.max_rate, self.rate + self.RATE_STEP)
+
+    def observe_chat(self, message, sender=None):
+        """Backs off on server/system throttle warnings. Messages from players are ignored."""
+        if not message or sender or PLAYER_CHAT.match(message):
+            return
+        if THROTTLE_PATTERNS.match(message):
+            with self.lock:
+                self._backoff(0.5)
+
+    def wrap(self, execute):
+        def governed_execute(command, *args, **kwargs):
+            self.acquire(minescript_ui.current_script() or "launcher")
+            start = time.monotonic()
+            try:
+                result = execute(command, *args, **kwargs)
+            except Exception:
+                self.record(time.monotonic() - start, error=True)
+                raise
+            self.record(time.monotonic() - start)
+            return result
+
+        governed_execute.__wrapped__ = execute
+        return governed_execute
+
+    def stats(self):
+        """Returns (allowed rate, measured commands/s over the last second, active scripts)."""
+        with self.lock:
+            now = time.monotonic()
+            while self.sent and now - self.sent[0] > 1.0:
+                self.sent.popleft()
+            active = sum(
+                1 for b in self.buckets.values() if now - b[2] < self.ACTIVE_WINDOW
+            )
+            return self.rate, len(self.sent), active
+
+
+# --- STALL WATCHDOG ---
+STALL_REPORT_PATH = os.path.join(BASE_DIR, "stall_report.log")
+
+
+class StallWatchdog:
+    """Detects Tk main-loop stalls.
+
+    A heartbeat is scheduled with after(). A background thread checks it and,
+    when the loop misses its deadline by more than the threshold, samples the
+    main thread's stack via sys._current_frames(). Once the loop recovers, the
+    stall is recorded and appended to the report file.
+    """
+
+    INTERVAL = 0.1  # Seconds between heartbeats
+    MAX_SAMPLES = 5
+
+    def __init__(self, app, threshold_ms, report_path=STALL_REPORT_PATH):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self.report_path = report_path
+        self.main_ident = threading.main_thread().ident
+        self.last_beat = time.monotonic()
+        self.current = None  # Stall in progress (watchdog thread only)
+        self.stalls = collections.deque(maxlen=20)
+        self.count = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+
+    def start(self):
+        self.app.after(int(self.INTERVAL * 1000), self._beat)
+        self.thread.start()
+
+    def _beat(self):
+        self.last_beat = time.monotonic()
+        self.app.after(int(self.INTERVAL * 1000), self._beat)
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.main_ident)
+        return "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+
+    def _watch(self):
+        while True:
+            time.sleep(self.INTERVAL / 2)
+            beat = self.last_beat
+            now = time.monotonic()
+            if self.current is None:
+                if now - beat - self.INTERVAL > self.threshold:
+                    self.current = {
+                        "since": beat,
+                        "wall": time.time() - (now - beat),
+                        "script": self.app.active_script_id,
+                        "samples": [self._sample()],
+                        "next_sample": now + self.threshold,
+                    }
+            elif beat > self.current["since"]:
+                self._record(beat)
+            elif now >= self.current["next_sample"] and len(self.current["samples"]) < self.MAX_SAMPLES:
+                self.current["samples"].append(self._sample())
+                self.current["next_sample"] = now + self.threshold
+
+    def _record(self, resumed):
+        stall, self.current = self.current, None
+        stall["duration"] = resumed - stall["since"] - self.INTERVAL
+        del stall["next_sample"]
+        with self.lock:
+            self.stalls.append(stall)
+            self.count += 1
+        try:
+            with open(self.report_path, "a", encoding="utf-8") as f:
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stall["wall"]))
+                f.write(
+                    f"=== {started} main loop stalled {stall['duration'] * 1000:.0f} ms"
+                    f" (running: {stall['script'] or 'none'}) ===\n"
+                )
+                for i, sample in enumerate(stall["samples"]):
+                    f.write(f"--- sample {i + 1} ---\n{sample}")
+                f.write("\n")
+        except OSError as e:
+            print(f"Failed to write stall report: {e}")
+
+    def recent(self):
+        with self.lock:
+            return list(self.stalls)
+
+
+# --- PROFILING ---
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+PROFILE_TOP_N = 10
+
+
+def list_profiles(script_id):
+    """Returns saved .prof files for a script, newest first."""
+    folder = os.path.join(PROFILE_DIR, script_id)
+    return sorted(glob.glob(os.path.join(folder, "*.prof")), reverse=True)
+
+
+class ThreadSampler:
+    """Sampling profiler for the single thread that calls enable().
+
+    From Python 3.12 cProfile is built on sys.monitoring and records every
+    thread, so there the script's thread is sampled through
+    sys._current_frames() instead. Call counts are sample counts, and each
+    sample is weighted by the measured time since the previous one, since the
+    sampler wakes late when the script holds the GIL. Same
+    enable/disable/dump_stats interface as cProfile.Profile, and the dump is
+    readable by pstats.
+    """
+
+    INTERVAL = 0.005
+
+    def __init__(self):
+        self.ident = None
+        self.hits = collections.Counter()
+        self.own = collections.Counter()  # { key: seconds }
+        self.cumulative = collections.Counter()  # { key: seconds }
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def enable(self):
+        self.ident = threading.get_ident()
+        self.thread.start()
+
+    def disable(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def _sample_loop(self):
+        last = time.perf_counter()
+        while not self.stop_event.wait(self.INTERVAL):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.ident)
+            seen = set()
+            top = True
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if top:
+                    self.own[key] += elapsed
+                    top = False
+                if key not in seen:
+                    seen.add(key)
+                    self.hits[key] += 1
+                    self.cumulative[key] += elapsed
+                frame = frame.f_back
+
+    def dump_stats(self, path):
+        stats = {
+            key: (hits, hits, self.own[key], self.cumulative[key], {})
+            for key, hits in self.hits.items()
+        }
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+
+def make_profiler():
+    """A profiler that only records the thread that enables it."""
+    if sys.version_info < (3, 12):
+        return cProfile.Profile()  # Per-thread before sys.monitoring
+    return ThreadSampler()
+
+
+def save_profile(script_id, profiler):
+    folder = os.path.join(PROFILE_DIR, script_id)
+    os.makedirs(folder, exist_ok=True)
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+    suffix = 0
+    path = os.path.join(folder, f"{stamp}-{suffix:02d}.prof")
+    while os.path.exists(path):  # Keeps names unique and in chronological order
+        suffix += 1
+        path = os.path.join(folder, f"{stamp}-{suffix:02d}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def profile_top(path, baseline=None, n=PROFILE_TOP_N):
+    """Top-n functions by own time, with the change against a baseline profile."""
+    stats = pstats.Stats(path).stats
+    base = pstats.Stats(baseline).stats if baseline else {}
+    rows = []
+    for key, (cc, nc, tt, ct, callers) in stats.items():
+        filename, line, func = key
+        prev = base.get(key)
+        rows.append({
+            "function": f"{func} ({os.path.basename(filename)}:{line})",
+            "calls": nc,
+            "own": tt,
+            "cumulative": ct,
+            "delta": tt - prev[2] if prev else None,
+        })
+    rows.sort(key=lambda r: r["own"], reverse=True)
+    return rows[:n]
+
+
+# --- MEMORY TRACKING ---
+class MemoryTracker:
+    """Opt-in tracemalloc accounting of what each script run leaves behind.
+
+    Snapshots are taken before and after every run and filtered to
+    allocations with one of the script's own files anywhere on the stack, so
+    objects built inside library code (json.loads, minescript calls, ...) on
+    the script's behalf are credited to it. A script is flagged when its
+    retained memory grew on each of the last LEAK_RUNS runs.
+    """
+
+    FRAMES = 32  # Stack depth kept per allocation
+    LEAK_RUNS = 3
+    MIN_GROWTH = 1024  # Bytes; smaller increases don't count as growth
+    TOP_LINES = 3
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.history = {}  # { script_id: deque of retained bytes after each run }
+        self.summaries = {}  # { script_id: summary dict }
+
+    @property
+    def enabled(self):
+        return tracemalloc.is_tracing()
+
+    def enable(self):
+        if tracemalloc.is_tracing() and tracemalloc.get_traceback_limit() < self.FRAMES:
+            tracemalloc.stop()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.FRAMES)
+
+    def disable(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def snapshot(self, files):
+        filters = [tracemalloc.Filter(True, f, all_frames=True) for f in files]
+        return tracemalloc.take_snapshot().filter_traces(filters) if filters else None
+
+    def record(self, script_id, before, after, files):
+        """Compares snapshots taken around a run and updates the script's summary."""
+        if before is None or after is None:
+            return
+        retained = sum(stat.size for stat in after.statistics("filename"))
+        growth = retained - sum(stat.size for stat in before.statistics("filename"))
+
+        # Credit each growing allocation to the innermost script line on its stack
+        own_files = {os.path.normcase(os.path.abspath(f)) for f in files}
+        by_line = collections.Counter()
+        for stat in after.compare_to(before, "traceback"):
+            if stat.size_diff <= 0:
+                continue
+            for frame in reversed(stat.traceback):  # Most recent frame last
+                if os.path.normcase(os.path.abspath(frame.filename)) in own_files:
+                    by_line[f"{os.path.basename(frame.filename)}:{frame.lineno}"] += stat.size_diff
+                    break
+        top = [
+            f"{line} {size / 1024:+.1f} KB"
+            for line, size in by_line.most_common(self.TOP_LINES)
+        ]
+        with self.lock:
+            history = self.history.setdefault(
+                script_id, collections.deque(maxlen=self.LEAK_RUNS + 1)
+            )
+            history.append(retained)
+            steps = list(zip(history, list(history)[1:]))
+            growing = len(steps) >= self.LEAK_RUNS and all(
+                b - a >= self.MIN_GROWTH for a, b in steps[-self.LEAK_RUNS:]
+            )
+            previous = self.summaries.get(script_id, {})
+            self.summaries[script_id] = {
+                "runs": previous.get("runs", 0) + 1,
+                "retained": retained,
+                "growth": growth,
+                "top": top,
+                "growing": growing,
+            }
+
+    def summary(self, script_id):
+        with self.lock:
+            return self.summaries.get(script_id)
+
+    def flagged(self):
+        with self.lock:
+            return sorted(k for k, v in self.summaries.items() if v["growing"])
+
+
+# --- CONTROL SERVER ---
+class ControlHandler(socketserver.StreamRequestHandler):
+    """One client connection. Reads newline-delimited JSON requests, writes JSON lines back."""
+
+    def setup(self):
+        super().setup()
+        self.outbox = queue.Queue(maxsize=256)
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def _write_loop(self):
+        while True:
+            msg = self.outbox.get()
+            if msg is None:
+                break
+            try:
+                self.wfile.write((json.dumps(msg, default=str) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (OSError, ValueError):
+                break
+
+    def send(self, msg):
+        """Queues a message without blocking; slow clients lose their oldest messages."""
+        while True:
+            try:
+                self.outbox.put_nowait(msg)
+                return
+            except queue.Full:
+                try:
+                    self.outbox.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def handle(self):
+        server = self.server
+        server.add_client(self)
+        try:
+            for raw in self.rfile:
+                line = raw.decode("utf-8", errors="replace").strip()
+                if not line:
+                    continue
+                # Anything that isn't a JSON line (e.g. an HTTP request from a
+                # web page) or lacks the token ends the connection
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as e:
+                    self.send({"ok": False, "error": f"Bad request: {e}"})
+                    return
+                if not server.check_token(request.get("token")):
+                    self.send({"id": request.get("id"), "ok": False, "error": "Invalid token"})
+                    return
+
+                if request.get("cmd") == "subscribe":
+                    server.subscribe(self)
+                    self.send({"id": request.get("id"), "ok": True, "result": "subscribed"})
+                    continue
+
+                future = server.submit(request)
+                try:
+                    try:
+                        result = future.result(timeout=server.timeout)
+                    except FutureTimeout:
+                        # Don't let the command run later after reporting failure
+                        if future.cancel():
+                            raise TimeoutError("Launcher busy, command not run") from None
+                        result = future.result()
+                    self.send({"id": request.get("id"), "ok": True, "result": result})
+                except Exception as e:
+                    self.send({"id": request.get("id"), "ok": False, "error": str(e)})
+        finally:
+            server.remove_client(self)
+
+    def finish(self):
+        # Let queued replies go out before the socket is closed
+        self.send(None)
+        self.writer.join(timeout=2)
+        super().finish()
+
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    """Loopback control API for driving the launcher from external tools.
+
+    Client threads never touch Tk: requests are queued and the overlay drains
+    them from its poll loop via drain(), resolving a Future per request.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    timeout = 10
+
+    def __init__(self, port, token):
+        super().__init__(("127.0.0.1", port), ControlHandler)
+        self.token = token
+        self.requests = queue.Queue()
+        self.clients = set()
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def check_token(self, token):
+        return isinstance(token, str) and hmac.compare_digest(token, self.token)
+
+    def add_client(self, client):
+        with self.lock:
+            self.clients.add(client)
+
+    def remove_client(self, client):
+        with self.lock:
+            self.clients.discard(client)
+            self.subscribers.discard(client)
+
+    def subscribe(self, client):
+        with self.lock:
+            self.subscribers.add(client)
+
+    def client_count(self):
+        with self.lock:
+            return len(self.clients)
+
+    def submit(self, request):
+        future = Future()
+        self.requests.put((request, future))
+        return future
+
+    def drain(self, handler, limit=50):
+        """Runs up to `limit` queued requests on the calling (Tk) thread."""
+        for _ in range(limit):
+            try:
+                request, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(handler(request))
+            except Exception as e:
+                future.set_exception(e)
+
+    def publish(self, event):
+        with self.lock:
+            targets = list(self.subscribers)
+        for client in targets:
+            client.send(event)
+
 
 # --- THEME COLORS ---
 COLOR_BG_SIDEBAR = "#181818"
@@ -145,9 +935,200 @@ CAT_ICONS = {
     "Farming": "🌾",
     "Settings": "⚙",
     "Uncategorized": "📂",
+    "Pipelines": "⛓",
 }
 
 
+# --- SCRIPT LIST (VIRTUALIZED) ---
+DESC_WIDTH = 350  # Pixels available for a card's one-line description
+class ScriptCard(customtkinter.CTkFrame):
+    """A reusable script row. VirtualScriptList rebinds it to different scripts on scroll."""
+
+    def __init__(self, master, on_run, on_config, height):
+        # CTk widgets take their size in the constructor, not in place()
+        super().__init__(master, fg_color="#333333", corner_radius=8, height=height)
+        self.pack_propagate(False)
+        self.meta = None
+        self.running = None
+
+        # Config Button
+        customtkinter.CTkButton(
+            self,
+            text="Configure",
+            width=80,
+            fg_color="transparent",
+            border_width=1,
+            border_color="gray",
+            text_color="white",
+            hover_color="#444444",
+            command=lambda: self.meta and on_config(self.meta),
+        ).pack(side="right", padx=15)
+
+        # Run/Stop Button
+        self.btn_run = customtkinter.CTkButton(
+            self,
+            text="Run",
+            width=60,
+            command=lambda: self.meta and on_run(self.meta),
+        )
+        self.btn_run.pack(side="right", padx=(0, 5))
+
+        # Text
+        info_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        info_frame.pack(side="left", padx=15, pady=10, fill="both", expand=True)
+
+        self.lbl_title = customtkinter.CTkLabel(
+            info_frame, text="", font=("Segoe UI", 16, "bold"), anchor="w"
+        )
+        self.lbl_title.pack(fill="x")
+
+        # Rows have a fixed height, so the description is kept to one line
+        self.desc_font = customtkinter.CTkFont(family="Segoe UI", size=12)
+        self.lbl_desc = customtkinter.CTkLabel(
+            info_frame,
+            text="",
+            font=self.desc_font,
+            text_color=COLOR_TEXT_DIM,
+            anchor="w",
+        )
+        self.lbl_desc.pack(fill="x")
+
+    def ellipsize(self, text, width=DESC_WIDTH):
+        """Shortens text with '…' so it fits on one line of `width` pixels."""
+        text = " ".join(text.split())
+        if self.desc_font.measure(text) <= width:
+            return text
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.desc_font.measure(text[:mid].rstrip() + "…") <= width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo].rstrip() + "…"
+
+    def show(self, meta, running):
+        if meta is self.meta and running == self.running:
+            return
+        if meta is not self.meta:
+            self.lbl_title.configure(text=meta["title"])
+            self.lbl_desc.configure(text=self.ellipsize(meta["desc"]))
+        if running != self.running:
+            self.btn_run.configure(
+                text="Stop" if running else "Run",
+                fg_color=COLOR_DANGER if running else COLOR_ACCENT,
+                hover_color=COLOR_DANGER_HOVER if running else COLOR_ACCENT_HOVER,
+            )
+        self.meta = meta
+        self.running = running
+
+
+class VirtualScriptList(customtkinter.CTkFrame):
+    """Scrollable script list that only materializes the cards in (or near) the viewport.
+
+    Cards are pooled and repositioned with place(), so the widget count depends on
+    the window height, not on how many scripts a category has.
+    """
+
+    ROW_HEIGHT = 86
+    CARD_GAP = 10
+    OVERSCAN = 2
+    WHEEL_STEP = 40
+
+    def __init__(self, master, on_run, on_config, is_running):
+        super().__init__(master, fg_color="transparent")
+        self.on_run = on_run
+        self.on_config = on_config
+        self.is_running = is_running
+        self.items = []
+        self.offset = 0
+        self.pool = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.viewport = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.bind("<Configure>", lambda e: self.layout())
+
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.lbl_empty = customtkinter.CTkLabel(
+            self.viewport, text="No scripts found.", text_color="gray"
+        )
+
+        # CTkBaseClass forbids bind_all, so bind through plain tkinter
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind_all(self.winfo_toplevel(), sequence, self.on_wheel, add="+")
+
+    def set_items(self, items):
+        if items is not self.items:
+            self.items = items
+            self.offset = 0
+        self.layout()
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.layout()
+
+    def on_scrollbar(self, action, *args):
+        total = len(self.items) * self.ROW_HEIGHT
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * total)
+        elif action == "scroll":
+            step = self.ROW_HEIGHT if args[1] == "units" else self.viewport.winfo_height()
+            self.scroll_to(self.offset + int(args[0]) * step)
+
+    def on_wheel(self, event):
+        if not self.winfo_ismapped() or not str(event.widget).startswith(str(self)):
+            return
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - self.WHEEL_STEP)
+        else:
+            self.scroll_to(self.offset + self.WHEEL_STEP)
+
+    def layout(self):
+        view_h = max(self.viewport.winfo_height(), 1)
+        total = len(self.items) * self.ROW_HEIGHT
+        self.offset = int(max(0, min(self.offset, total - view_h)))
+
+        if self.items:
+            self.lbl_empty.place_forget()
+        else:
+            self.lbl_empty.place(relx=0.5, y=20, anchor="n")
+
+        first = max(0, self.offset // self.ROW_HEIGHT - self.OVERSCAN)
+        last = min(
+            len(self.items),
+            (self.offset + view_h) // self.ROW_HEIGHT + 1 + self.OVERSCAN,
+        )
+
+        while len(self.pool) < last - first:
+            self.pool.append(
+                ScriptCard(
+                    self.viewport,
+                    self.on_run,
+                    self.on_config,
+                    height=self.ROW_HEIGHT - self.CARD_GAP,
+                )
+            )
+
+        for i, card in enumerate(self.pool):
+            index = first + i
+            if index < last:
+                meta = self.items[index]
+                card.show(meta, self.is_running(meta))
+                card.place(x=0, y=index * self.ROW_HEIGHT - self.offset, relwidth=1)
+            else:
+                card.place_forget()
+
+        if total > view_h:
+            self.scrollbar.set(self.offset / total, (self.offset + view_h) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
 class OverlayApp(customtkinter.CTk):
     def __init__(self):
         super().__init__()
@@ -174,26 +1155,89 @@ class OverlayApp(customtkinter.CTk):
         self.view_mode = "HOME"
         self.selected_category = None
         self.current_script_meta = None
-        self.current_module = None
         self.config_vars = {}
 
         self.running_thread = None
         self.stop_event = threading.Event()
         self.active_script_id = None
         self.binding_mode = False
+        self.binding_target = None
+        self.pipeline_status = ""
+        self.profiling_script_id = None
+        self.profile_baselines = {}  # { script_id: baseline .prof path }
+        self.profile_cache = {}  # { (path, baseline): rows }
+        self.run_progress = None  # Latest fraction reported by the running script
+        self.run_status_text = ""
+        self.progress_bar = None
+
+        # Worker threads never call Tk directly; they post here instead
+        self.mailbox = minescript_ui.Mailbox()
+        minescript_ui.install_mailbox(self.mailbox)
+        self.last_mailbox_drain = 0
+
+        self.memory = MemoryTracker()
+        if CFG.get("memory_tracking", DEFAULT_CFG["memory_tracking"]):
+            self.memory.enable()
+
+        self.residency = ModuleResidency(
+            self.scripts_dir,
+            max_modules=CFG.get("max_resident_modules", DEFAULT_CFG["max_resident_modules"]),
+            max_kb=CFG.get("max_resident_kb", DEFAULT_CFG["max_resident_kb"]),
+        )
 
         # --- UI COMPONENTS ---
         self.setup_ui()
         self.bind("<Key>", self.on_gui_key)
 
         # --- LOGIC ---
+        # Wrap execute before scripts are imported, so `from minescript import execute`
+        # also picks up the governed version
+        self.governor = None
+        max_rate = CFG.get("command_rate_max", DEFAULT_CFG["command_rate_max"])
+        if max_rate:
+            min_rate = CFG.get("command_rate_min", DEFAULT_CFG["command_rate_min"])
+            self.governor = CommandGovernor(min(min_rate, max_rate), max_rate)
+            minescript.execute = self.governor.wrap(minescript.execute)
+            self.lbl_governor.pack(side="right", padx=15)
+        self.last_governor_update = 0
+
         self.load_scripts()  # This will call render_sidebar which needs render_home
         self.hide_overlay()
 
+        self.watchdog = None
+        self.stalls_seen = 0
+        self.stall_notice_until = 0
+        threshold = CFG.get("stall_threshold_ms", DEFAULT_CFG["stall_threshold_ms"])
+        if threshold:
+            self.watchdog = StallWatchdog(self, threshold)
+            self.watchdog.start()
+
         self.event_queue = minescript.EventQueue()
+        self.event_bus = minescript_ui.EventBus()
+        minescript_ui.install_event_bus(self.event_bus)
+        self.event_bus.registered.add("key")  # Always needed for the toggle key
         self.event_queue.register_key_listener()
+        if self.governor:
+            self.event_bus.requested.add("chat")  # Throttle warnings slow the governor
+        self.last_tick = time.monotonic()
         self.after(50, self.poll_minescript_events)
 
+        self.control = None
+        self.run_count = 0
+        self.run_generation = 0  # Identifies the current run in mailbox messages
+        self.run_started_at = None
+        self.last_run_seconds = None
+        port = CFG.get("control_port", DEFAULT_CFG["control_port"])
+        if port:
+            if not CFG.get("control_token"):
+                CFG["control_token"] = secrets.token_hex(16)  # Per-install secret
+                save_config()
+            try:
+                self.control = ControlServer(port, CFG["control_token"])
+                self.control.start()
+            except OSError as e:
+                print(f"Control API disabled: {e}")
+
         # Initial render based on view_mode = "HOME"
         # Call refresh_ui AFTER load_scripts so script counts are available for home
         self.refresh_ui() 
@@ -288,6 +1332,16 @@ class OverlayApp(customtkinter.CTk):
         )
         self.content_area.grid(row=1, column=1, sticky="nsew", padx=20, pady=10)
 
+        # Browser view uses a virtualized list in the same cell
+        self.script_list = VirtualScriptList(
+            self,
+            on_run=self.toggle_script,
+            on_config=self.open_config,
+            is_running=lambda meta: self.active_script_id == meta["id"],
+        )
+        self.script_list.grid(row=1, column=1, sticky="nsew", padx=20, pady=10)
+        self.script_list.grid_remove()
+
         # 4. Status Bar (Row 2, Col 1)
         self.status_bar = customtkinter.CTkFrame(
             self, fg_color="#1F1F1F", height=30, corner_radius=0
@@ -302,6 +1356,21 @@ class OverlayApp(customtkinter.CTk):
         )
         self.lbl_status.pack(side="left", padx=15)
 
+        self.lbl_stall = customtkinter.CTkLabel(
+            self.status_bar,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=COLOR_DANGER,
+        )
+        self.lbl_stall.pack(side="left", padx=5)
+
+        self.lbl_governor = customtkinter.CTkLabel(
+            self.status_bar,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=COLOR_TEXT_DIM,
+        )
+
         self.lbl_hint = customtkinter.CTkLabel(
             self.status_bar,
             text="Toggle: R-Shift",
@@ -313,6 +1382,8 @@ class OverlayApp(customtkinter.CTk):
     # --- UI RENDERING METHODS (DEFINED EARLY TO AVOID FORWARD REFERENCE ISSUES) ---
 
     def clear_content(self):
+        self.script_list.grid_remove()
+        self.content_area.grid()
         for w in self.content_area.winfo_children():
             w.destroy()
 
@@ -324,6 +1395,8 @@ class OverlayApp(customtkinter.CTk):
             self.render_browser()
         elif self.view_mode == "CONFIG":
             self.render_config()
+        elif self.view_mode == "PIPELINES":
+            self.render_pipelines()
 
     def render_sidebar(self):
         # Update Home button highlight
@@ -355,6 +1428,21 @@ class OverlayApp(customtkinter.CTk):
             )
             btn.pack(fill="x", pady=2, padx=5)
 
+        if CFG.get("pipelines"):
+            is_active = self.view_mode == "PIPELINES"
+            customtkinter.CTkButton(
+                self.cat_frame,
+                text=f"{CAT_ICONS['Pipelines']}  Pipelines",
+                anchor="w",
+                fg_color="#333333" if is_active else "transparent",
+                text_color=COLOR_ACCENT if is_active else COLOR_TEXT_MAIN,
+                hover_color="#333333",
+                height=40,
+                corner_radius=6,
+                font=("Segoe UI", 14),
+                command=self.open_pipelines,
+            ).pack(fill="x", pady=2, padx=5)
+
     def render_home(self):
         self.clear_content()
         self.lbl_view_title.configure(text="Home")
@@ -380,6 +1468,33 @@ class OverlayApp(customtkinter.CTk):
             text_color=COLOR_TEXT_DIM,
         ).pack(pady=5)
 
+        resident_count, resident_bytes = self.residency.stats()
+        customtkinter.CTkLabel(
+            self.content_area,
+            text=f"Resident Modules: {resident_count} (~{resident_bytes / 1024:.0f} KB)",
+            font=("Segoe UI", 16),
+            text_color=COLOR_TEXT_DIM,
+        ).pack(pady=5)
+
+        memory_var = customtkinter.BooleanVar(value=self.memory.enabled)
+        customtkinter.CTkSwitch(
+            self.content_area,
+            text="Track script memory (slower runs)",
+            variable=memory_var,
+            progress_color=COLOR_ACCENT,
+            command=lambda: self.set_memory_tracking(memory_var.get()),
+        ).pack(pady=5)
+
+        flagged = self.memory.flagged()
+        if flagged:
+            customtkinter.CTkLabel(
+                self.content_area,
+                text=f"⚠ Memory keeps growing: {', '.join(flagged)}",
+                font=("Segoe UI", 14),
+                text_color=COLOR_DANGER,
+                wraplength=400,
+            ).pack(pady=5)
+
         customtkinter.CTkLabel(
             self.content_area,
             text="Use the sidebar to browse categories or manage settings.",
@@ -389,67 +1504,10 @@ class OverlayApp(customtkinter.CTk):
         ).pack(pady=20)
 
     def render_browser(self):
-        self.clear_content()
         self.lbl_view_title.configure(text=f"{self.selected_category}")
-
-        scripts = self.script_tree.get(self.selected_category, [])
-        if not scripts:
-            customtkinter.CTkLabel(
-                self.content_area, text="No scripts found.", text_color="gray"
-            ).pack(pady=20)
-            return
-
-        for s in scripts:
-            # Card
-            card = customtkinter.CTkFrame(
-                self.content_area, fg_color="#333333", corner_radius=8
-            )
-            card.pack(fill="x", pady=5)
-
-            # Config Button
-            customtkinter.CTkButton(
-                card,
-                text="Configure",
-                width=80,
-                fg_color="transparent",
-                border_width=1,
-                border_color="gray",
-                text_color="white",
-                hover_color="#444444",
-                command=lambda meta=s: self.open_config(meta),
-            ).pack(side="right", padx=15)
-
-            # Run/Stop Button
-            is_running = self.active_script_id == s["id"]
-            btn_text = "Stop" if is_running else "Run"
-            btn_fg = COLOR_DANGER if is_running else COLOR_ACCENT
-            btn_hover = COLOR_DANGER_HOVER if is_running else COLOR_ACCENT_HOVER
-
-            customtkinter.CTkButton(
-                card,
-                text=btn_text,
-                width=60,
-                fg_color=btn_fg,
-                hover_color=btn_hover,
-                command=lambda meta=s: self.toggle_script(meta),
-            ).pack(side="right", padx=(0, 5))
-
-            # Text
-            info_frame = customtkinter.CTkFrame(card, fg_color="transparent")
-            info_frame.pack(side="left", padx=15, pady=15, fill="both", expand=True)
-
-            customtkinter.CTkLabel(
-                info_frame, text=s["title"], font=("Segoe UI", 16, "bold"), anchor="w"
-            ).pack(fill="x")
-
-            customtkinter.CTkLabel(
-                info_frame,
-                text=s["desc"],
-                font=("Segoe UI", 12),
-                text_color=COLOR_TEXT_DIM,
-                anchor="w",
-                wraplength=350,
-            ).pack(fill="x")
+        self.content_area.grid_remove()
+        self.script_list.grid()
+        self.script_list.set_items(self.script_tree.get(self.selected_category, []))
 
     def render_config(self):
         self.clear_content()
@@ -485,7 +1543,7 @@ class OverlayApp(customtkinter.CTk):
             width=150,
             fg_color=btn_col,
             hover_color="#555555",
-            command=self.enable_binding_mode,
+            command=lambda: self.enable_binding_mode(meta["id"]),
         ).pack(side="right")
 
         # Controls
@@ -553,22 +1611,234 @@ class OverlayApp(customtkinter.CTk):
                 font=("Segoe UI", 16, "bold"),
                 command=self.stop_script,
             ).pack(fill="x")
-            # Progress spinner
-            customtkinter.CTkProgressBar(
-                action_frame, mode="indeterminate", progress_color=COLOR_ACCENT
-            ).pack(fill="x", pady=10)
+            if self.profiling_script_id == meta["id"]:
+                customtkinter.CTkLabel(
+                    action_frame, text="Profiling this run...", text_color=COLOR_TEXT_DIM
+                ).pack(pady=(10, 0))
+            # Progress: determinate once the script reports any
+            self.progress_bar = customtkinter.CTkProgressBar(
+                action_frame, progress_color=COLOR_ACCENT
+            )
+            self.progress_bar.pack(fill="x", pady=10)
+            self.update_progress_widgets()
         else:
+            self.progress_bar = None
             self.lbl_status.configure(text="Ready", text_color=COLOR_TEXT_DIM)
+            run_row = customtkinter.CTkFrame(action_frame, fg_color="transparent")
+            run_row.pack(fill="x")
             customtkinter.CTkButton(
-                action_frame,
+                run_row,
+                text="Profile run",
+                width=120,
+                height=50,
+                fg_color="#444444",
+                hover_color="#555555",
+                command=lambda: self.run_script(profile=True),
+            ).pack(side="right", padx=(10, 0))
+            customtkinter.CTkButton(
+                run_row,
                 text="RUN SCRIPT",
                 fg_color=COLOR_ACCENT,
                 hover_color=COLOR_ACCENT_HOVER,
                 height=50,
                 font=("Segoe UI", 16, "bold"),
                 command=self.run_script,
+            ).pack(side="left", fill="x", expand=True)
+            customtkinter.CTkButton(
+                action_frame,
+                text="Add to Queue",
+                fg_color="transparent",
+                border_width=1,
+                border_color="gray",
+                hover_color="#444444",
+                command=self.queue_current_script,
+            ).pack(fill="x", pady=(10, 0))
+
+        self.render_memory(meta)
+        self.render_profile(meta)
+
+    def render_memory(self, meta):
+        """Shows what the script's runs left allocated, when memory tracking is on."""
+        summary = self.memory.summary(meta["id"])
+        if summary is None:
+            return
+        text = (
+            f"Memory: {summary['retained'] / 1024:.1f} KB retained by this script's files"
+            f" ({summary['growth'] / 1024:+.1f} KB last run, {summary['runs']} runs tracked)"
+        )
+        if summary["growing"]:
+            text += f"\n⚠ Grew on each of the last {MemoryTracker.LEAK_RUNS} runs - possible leak"
+        if summary["top"]:
+            text += "\nTop growth: " + ", ".join(summary["top"])
+        customtkinter.CTkLabel(
+            self.content_area,
+            text=text,
+            font=("Segoe UI", 12),
+            text_color=COLOR_DANGER if summary["growing"] else COLOR_TEXT_DIM,
+            anchor="w",
+            justify="left",
+            wraplength=550,
+        ).pack(fill="x", pady=(0, 20))
+
+    def render_profile(self, meta):
+        """Shows the hot functions of the script's latest profiled run."""
+        profiles = list_profiles(meta["id"])
+        if not profiles:
+            return
+        latest, previous = profiles[0], profiles[1:]
+        baseline = self.profile_baselines.get(meta["id"])
+        if baseline not in previous:
+            baseline = previous[0] if previous else None
+
+        frame = customtkinter.CTkFrame(self.content_area, fg_color="#2B2B2B", corner_radius=8)
+        frame.pack(fill="x", pady=(0, 20))
+
+        header = customtkinter.CTkFrame(frame, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(10, 5))
+        customtkinter.CTkLabel(
+            header,
+            text=f"Last profile: {os.path.basename(latest)[:-5]}",
+            font=("Segoe UI", 14, "bold"),
+            anchor="w",
+        ).pack(side="left")
+
+        if previous:
+            names = [os.path.basename(p)[:-5] for p in previous[:10]]
+
+            def _set_baseline(name, script_id=meta["id"]):
+                self.profile_baselines[script_id] = os.path.join(
+                    PROFILE_DIR, script_id, name + ".prof"
+                )
+                self.render_config()
+
+            baseline_menu = customtkinter.CTkOptionMenu(
+                header,
+                values=names,
+                command=_set_baseline,
+                width=150,
+                fg_color="#444",
+                button_color="#555",
+            )
+            baseline_menu.set(os.path.basename(baseline)[:-5])
+            baseline_menu.pack(side="right")
+            customtkinter.CTkLabel(header, text="vs", text_color=COLOR_TEXT_DIM).pack(
+                side="right", padx=5
+            )
+
+        key = (latest, baseline)
+        if key not in self.profile_cache:
+            try:
+                self.profile_cache[key] = profile_top(latest, baseline)
+            except Exception as e:
+                self.profile_cache[key] = []
+                print(f"Failed to read profile {latest}: {e}")
+
+        lines = [f"{'own s':>8} {'cum s':>8} {'calls':>7} {'Δ own':>8}  function"]
+        for row in self.profile_cache[key]:
+            if row["delta"] is not None:
+                delta = f"{row['delta']:+8.3f}"
+            else:
+                delta = f"{'new' if baseline else '-':>8}"
+            lines.append(
+                f"{row['own']:8.3f} {row['cumulative']:8.3f} {row['calls']:7d} {delta}  {row['function']}"
+            )
+        customtkinter.CTkLabel(
+            frame,
+            text="\n".join(lines),
+            font=("Consolas", 11),
+            text_color=COLOR_TEXT_DIM,
+            anchor="w",
+            justify="left",
+        ).pack(fill="x", padx=10, pady=(0, 10))
+
+    def render_pipelines(self):
+        self.clear_content()
+        self.lbl_view_title.configure(text="Pipelines")
+
+        pipelines = CFG.get("pipelines", {})
+        if not pipelines:
+            customtkinter.CTkLabel(
+                self.content_area, text="No pipelines configured.", text_color="gray"
+            ).pack(pady=20)
+            return
+
+        for name, steps in pipelines.items():
+            pipeline_id = PIPELINE_PREFIX + name
+            is_running = self.active_script_id == pipeline_id
+
+            card = customtkinter.CTkFrame(
+                self.content_area, fg_color="#333333", corner_radius=8
+            )
+            card.pack(fill="x", pady=5)
+
+            customtkinter.CTkButton(
+                card,
+                text="Delete",
+                width=60,
+                fg_color="transparent",
+                border_width=1,
+                border_color="gray",
+                text_color="white",
+                hover_color="#444444",
+                command=lambda n=name: self.delete_pipeline(n),
+            ).pack(side="right", padx=15)
+
+            bound_key = get_shortcut_key_for_script(pipeline_id)
+            key_text = keycode_to_name(bound_key) if bound_key else "[None]"
+            binding = self.binding_mode and self.binding_target == pipeline_id
+            customtkinter.CTkButton(
+                card,
+                text="PRESS ANY KEY..." if binding else f"Key: {key_text}",
+                width=110,
+                fg_color=COLOR_ACCENT if binding else "#444444",
+                hover_color="#555555",
+                command=lambda i=pipeline_id: self.enable_binding_mode(i),
+            ).pack(side="right", padx=(0, 5))
+
+            customtkinter.CTkButton(
+                card,
+                text="Stop" if is_running else "Run",
+                width=60,
+                fg_color=COLOR_DANGER if is_running else COLOR_ACCENT,
+                hover_color=COLOR_DANGER_HOVER if is_running else COLOR_ACCENT_HOVER,
+                command=lambda n=name: self.toggle_pipeline(n),
+            ).pack(side="right", padx=(0, 5))
+
+            info_frame = customtkinter.CTkFrame(card, fg_color="transparent")
+            info_frame.pack(side="left", padx=15, pady=15, fill="both", expand=True)
+
+            customtkinter.CTkLabel(
+                info_frame, text=name, font=("Segoe UI", 16, "bold"), anchor="w"
             ).pack(fill="x")
 
+            summary = " → ".join(step.get("script", "?") for step in steps)
+            if is_running and self.pipeline_status:
+                summary = self.pipeline_status
+            customtkinter.CTkLabel(
+                info_frame,
+                text=summary,
+                font=("Segoe UI", 12),
+                text_color=COLOR_ACCENT if is_running else COLOR_TEXT_DIM,
+                anchor="w",
+                wraplength=350,
+            ).pack(fill="x")
+
+            # One removable chip per step, so a wrong entry doesn't cost the whole pipeline
+            steps_frame = customtkinter.CTkFrame(info_frame, fg_color="transparent")
+            steps_frame.pack(fill="x", pady=(5, 0))
+            for index, step in enumerate(steps):
+                customtkinter.CTkButton(
+                    steps_frame,
+                    text=f"{index + 1}. {step.get('script', '?')}  ✕",
+                    width=0,
+                    height=22,
+                    font=("Segoe UI", 11),
+                    fg_color="#444444",
+                    hover_color=COLOR_DANGER_HOVER,
+                    state="disabled" if is_running else "normal",
+                    command=lambda n=name, i=index: self.remove_pipeline_step(n, i),
+                ).grid(row=index // 4, column=index % 4, padx=(0, 4), pady=2, sticky="w")
+
     def toggle_script(self, meta):
         script_id = meta["id"]
         if self.active_script_id == script_id:
@@ -577,20 +1847,8 @@ class OverlayApp(customtkinter.CTk):
             minescript.echo("Another script is already running. Stop it first.")
         else:
             self.current_script_meta = meta
-            self.current_module = meta["module"]
-            
-            defaults = {
-                k: v.get("default") for k, v in meta["config"]["controls"].items()
-            }
-            # Merge saved params over defaults
-            params = defaults.copy()
-            params.update(meta.get("params", {}))
-            
-            self.start_script_thread(params, script_id)
-
-    def clear_content(self):
-        for w in self.content_area.winfo_children():
-            w.destroy()
+            # Saved params override the schema defaults
+            self.start_script_thread(meta.get("params", {}), script_id)
 
     def go_home(self):
         self.view_mode = "HOME"
@@ -614,8 +1872,7 @@ class OverlayApp(customtkinter.CTk):
 
             module_name = os.path.splitext(os.path.basename(f))[0]
             try:
-                mod = importlib.import_module(module_name)
-                importlib.reload(mod)
+                mod, deps = self.residency.import_script(module_name)
 
                 if hasattr(mod, "UI_CONFIG"):
                     conf = mod.UI_CONFIG
@@ -633,10 +1890,16 @@ class OverlayApp(customtkinter.CTk):
                         "config": conf,
                         "params": {},
                     }
+                    self.residency.admit(meta, mod, deps)
                     self.script_tree[cat].append(meta)
             except Exception as e:
                 print(f"Failed to load {module_name}: {e}")
 
+        self.residency.forget_missing(
+            {s["id"] for scripts in self.script_tree.values() for s in scripts}
+        )
+        self.residency.enforce_budget()
+
         self.categories.sort()
         if "Uncategorized" in self.categories:
             self.categories.remove("Uncategorized")
@@ -674,6 +1937,61 @@ class OverlayApp(customtkinter.CTk):
         self.view_mode = "CONFIG"
         self.refresh_ui()
 
+    def set_memory_tracking(self, enabled):
+        if enabled:
+            self.memory.enable()
+        else:
+            self.memory.disable()
+        CFG["memory_tracking"] = enabled
+        save_config()
+
+    def open_pipelines(self):
+        self.selected_category = None
+        self.view_mode = "PIPELINES"
+        self.refresh_ui()
+
+    def queue_current_script(self):
+        """Appends the current script and its live params to the "Queue" pipeline."""
+        meta = self.current_script_meta
+        params = {k: v.get() for k, v in self.config_vars.items()}
+        meta["params"] = params
+        pipelines = CFG.setdefault("pipelines", {})
+        pipelines.setdefault("Queue", []).append(
+            {"script": meta["id"], "params": params, "continue_on_error": False}
+        )
+        save_config()
+        minescript.echo(f"Queued {meta['title']} ({len(pipelines['Queue'])} in Queue).")
+        self.render_sidebar()
+
+    def delete_pipeline(self, name):
+        pipeline_id = PIPELINE_PREFIX + name
+        if self.active_script_id == pipeline_id:
+            minescript.echo("Stop the pipeline first.")
+            return
+        CFG.get("pipelines", {}).pop(name, None)
+        CFG["shortcuts"] = {
+            k: v for k, v in CFG.get("shortcuts", {}).items() if v != pipeline_id
+        }
+        save_config()
+        if CFG.get("pipelines"):
+            self.refresh_ui()
+        else:
+            self.go_home()
+
+    def remove_pipeline_step(self, name, index):
+        if self.active_script_id == PIPELINE_PREFIX + name:
+            minescript.echo("Stop the pipeline first.")
+            return
+        steps = CFG.get("pipelines", {}).get(name, [])
+        if not 0 <= index < len(steps):
+            return
+        steps.pop(index)
+        if not steps:
+            self.delete_pipeline(name)
+            return
+        save_config()
+        self.refresh_ui()
+
     def go_back(self):
         if self.view_mode == "CONFIG":
             # Save current params before leaving
@@ -682,7 +2000,7 @@ class OverlayApp(customtkinter.CTk):
                  self.current_script_meta["params"] = params
             
             self.select_category(self.selected_category)
-        elif self.view_mode == "BROWSER":
+        elif self.view_mode in ("BROWSER", "PIPELINES"):
             self.go_home()
         else:
             self.hide_overlay()
@@ -714,36 +2032,146 @@ class OverlayApp(customtkinter.CTk):
         self.refresh_ui()
 
     def on_gui_key(self, event):
-        if self.binding_mode and self.view_mode == "CONFIG":
+        if self.binding_mode and self.view_mode in ("CONFIG", "PIPELINES"):
             self.bind_shortcut(tkinter_to_glfw(event.keycode))
 
-    def enable_binding_mode(self):
+    def enable_binding_mode(self, target=None):
+        """Waits for a key to bind to `target` (a script or pipeline id, default: current script)."""
         self.binding_mode = True
-        self.render_config()
+        self.binding_target = target or self.current_script_meta["id"]
+        self.refresh_ui()
         self.focus_force()
 
     def bind_shortcut(self, key):
-        script_id = self.current_script_meta["id"]
+        script_id = self.binding_target
         shortcuts = CFG.get("shortcuts", {})
         new_shortcuts = {k: v for k, v in shortcuts.items() if v != script_id}
         new_shortcuts[int(key)] = script_id
         CFG["shortcuts"] = new_shortcuts
         save_config()
         self.binding_mode = False
-        self.render_config()
+        self.binding_target = None
+        self.refresh_ui()
+
+    def register_event_listeners(self):
+        for event_type in self.event_bus.take_requested():
+            method = EVENT_LISTENERS.get(event_type)
+            if method is None:
+                continue  # "tick" is generated here; unknown types never fire
+            try:
+                getattr(self.event_queue, method)()
+            except Exception as e:
+                print(f"Failed to register {event_type} listener: {e}")
 
     def poll_minescript_events(self):
+        self.register_event_listeners()
         try:
             while True:
                 event = self.event_queue.get(block=False)
                 if not event:
                     break
-                if event.type == minescript.EventType.KEY and event.action == 1:
-                    self.handle_game_key(event.key)
+                if event.type == minescript.EventType.KEY:
+                    if event.action == 0:
+                        self.event_bus.keys_down.discard(event.key)
+                    else:
+                        self.event_bus.keys_down.add(event.key)
+                    self.event_bus.publish("key", event)
+                    if event.action == 1:
+                        self.handle_game_key(event.key)
+                else:
+                    if self.governor and str(event.type) == "chat":
+                        self.governor.observe_chat(
+                            getattr(event, "message", ""), getattr(event, "sender", None)
+                        )
+                    self.event_bus.publish(str(event.type), event)
         except:
             pass
+
+        now = time.monotonic()
+        if now - self.last_tick >= TICK_INTERVAL:
+            self.last_tick = now
+            if self.event_bus.has_subscribers("tick"):
+                self.event_bus.publish("tick", types.SimpleNamespace(type="tick", time=time.time()))
+        if self.governor and now - self.last_governor_update >= 0.5:
+            self.last_governor_update = now
+            rate, sent, active = self.governor.stats()
+            self.lbl_governor.configure(
+                text=f"Cmds {sent}/s · limit {rate:.0f}/s" + (f" · {active} scripts" if active > 1 else "")
+            )
+
+        if self.watchdog:
+            self.update_stall_notice(now)
+
+        if now - self.last_mailbox_drain >= MAILBOX_INTERVAL:
+            self.last_mailbox_drain = now
+            self.drain_mailbox()
+
+        if self.control:
+            self.control.drain(self.handle_control_request)
         self.after(20, self.poll_minescript_events)
 
+    def drain_mailbox(self):
+        """Applies the latest value of every key posted since the last drain."""
+        progress_changed = False
+        for (source, kind), value in self.mailbox.drain().items():
+            if source == "launcher":
+                # Messages from an earlier run must not touch the current one
+                if kind == "finish" and value == self.run_generation:
+                    if self.active_script_id is not None:
+                        self._finish_run()
+                elif kind == "step" and value[0] == self.run_generation:
+                    self._pipeline_step_changed(*value[1:])
+            elif self.active_script_id is not None:
+                if kind == "progress":
+                    self.run_progress = value
+                elif kind == "status":
+                    self.run_status_text = value
+                progress_changed = True
+        if progress_changed:
+            self.update_progress_widgets()
+            self.publish_state(
+                "progress", progress=self.run_progress, text=self.run_status_text
+            )
+
+    def update_progress_widgets(self):
+        if self.active_script_id is None:
+            return
+        title = self.active_script_id
+        if self.current_script_meta and self.current_script_meta["id"] == title:
+            title = self.current_script_meta["title"]
+        text = f"Running: {title}"
+        if self.run_status_text:
+            text += f" · {self.run_status_text}"
+        if self.run_progress is not None:
+            text += f" ({self.run_progress:.0%})"
+        self.lbl_status.configure(text=text, text_color=COLOR_ACCENT)
+
+        bar = self.progress_bar
+        if bar is None or not bar.winfo_exists():
+            return
+        if self.run_progress is None:
+            if bar.cget("mode") != "indeterminate":
+                bar.configure(mode="indeterminate")
+                bar.start()
+        else:
+            if bar.cget("mode") != "determinate":
+                bar.stop()
+                bar.configure(mode="determinate")
+            bar.set(self.run_progress)
+
+    def update_stall_notice(self, now):
+        if self.watchdog.count != self.stalls_seen:
+            self.stalls_seen = self.watchdog.count
+            last_stall = self.watchdog.recent()[-1]
+            self.stall_notice_until = now + 10
+            self.lbl_stall.configure(
+                text=f"⚠ UI stalled {last_stall['duration'] * 1000:.0f} ms (stall_report.log)"
+            )
+            self.publish_state("stall", duration=last_stall["duration"])
+        elif self.stall_notice_until and now > self.stall_notice_until:
+            self.stall_notice_until = 0
+            self.lbl_stall.configure(text="")
+
     def handle_game_key(self, key):
         if minescript.screen_name() is None:
             if key == CFG["key_toggle"]:
@@ -752,6 +2180,10 @@ class OverlayApp(customtkinter.CTk):
                 self.run_shortcut(CFG["shortcuts"][key])
 
     def run_shortcut(self, script_name):
+        if script_name.startswith(PIPELINE_PREFIX):
+            self.toggle_pipeline(script_name[len(PIPELINE_PREFIX):])
+            return
+
         meta = None
         for cat, list_ in self.script_tree.items():
             for s in list_:
@@ -760,7 +2192,7 @@ class OverlayApp(customtkinter.CTk):
         if not meta:
             return
 
-        if self.running_thread and self.running_thread.is_alive():
+        if self.is_busy() or self.active_script_id is not None:
             if self.active_script_id == script_name:
                 minescript.echo(f"Stopping {script_name}...")
                 self.stop_script()
@@ -769,61 +2201,393 @@ class OverlayApp(customtkinter.CTk):
             return
 
         minescript.echo(f"Starting {script_name}...")
-        self.current_script_meta = meta
-        self.current_module = meta["module"]
 
-        # Determine params
-        if self.view_mode == "CONFIG" and self.current_script_meta["id"] == script_name:
+        # Determine params (check the page being viewed before switching metas)
+        viewed = self.current_script_meta
+        if self.view_mode == "CONFIG" and viewed and viewed["id"] == script_name:
              # We are editing this script, take live values
              params = {k: v.get() for k, v in self.config_vars.items()}
         else:
-             # Load from meta/defaults
-             defaults = {k: v.get("default") for k, v in meta["config"]["controls"].items()}
-             params = defaults.copy()
-             params.update(meta.get("params", {}))
+             # Saved params override the schema defaults
+             params = meta.get("params", {})
+        self.current_script_meta = meta
 
         self.start_script_thread(params, script_name)
 
-    def run_script(self):
-        if self.running_thread and self.running_thread.is_alive():
+    def run_script(self, profile=False):
+        if self.is_busy() or self.active_script_id is not None:
             return
         params = {k: v.get() for k, v in self.config_vars.items()}
         self.current_script_meta["params"] = params
-        self.start_script_thread(params, self.current_script_meta["id"])
+        self.start_script_thread(params, self.current_script_meta["id"], profile=profile)
+
+    def start_script_thread(self, values, script_id, profile=False):
+        try:
+            params = compile_params(self.current_script_meta["config"])(**values)
+        except ValueError as e:
+            minescript.echo(f"Invalid params for {script_id}: {e}")
+            return False
+        try:
+            mod = self.residency.acquire(self.current_script_meta)
+        except Exception as e:
+            minescript.echo(f"Failed to load {script_id}: {e}")
+            return False
+        self.residency.pin(script_id)
+        self.residency.enforce_budget()
 
-    def start_script_thread(self, params, script_id):
         self.stop_event.clear()
         self.active_script_id = script_id
+        self.profiling_script_id = script_id if profile else None
+        self.run_progress = None
+        self.run_status_text = ""
         if self.visible:
             self.refresh_ui()
 
+        self.run_generation += 1
         self.running_thread = threading.Thread(
             target=self._worker,
-            args=(self.current_module, params, self.stop_event),
+            args=(mod, params, self.stop_event, script_id, self.run_generation, profile),
             daemon=True,
         )
         self.running_thread.start()
-
-    def _worker(self, mod, params, evt):
+        self.run_count += 1
+        self.run_started_at = time.monotonic()
+        self.publish_state("started")
+        return True
+
+    def _run_module(self, mod, params, evt, script_id):
+        """Runs one script on the current thread. Returns False if it raised."""
+        minescript_ui._set_current_script(script_id)
+        tracked_files = self.residency.files(script_id) if self.memory.enabled else []
+        before = self.memory.snapshot(tracked_files) if tracked_files else None
         try:
             if hasattr(mod, "run"):
                 mod.run(params, evt)
+            return True
         except Exception as e:
             minescript.echo(f"Error: {e}")
+            return False
+        finally:
+            minescript_ui._set_current_script(None)
+            self.event_bus.unsubscribe_owner(script_id)
+            if before is not None and self.memory.enabled:
+                gc.collect()
+                self.memory.record(
+                    script_id, before, self.memory.snapshot(tracked_files), tracked_files
+                )
+
+    def _worker(self, mod, params, evt, script_id, generation, profile=False):
+        # Enabled on this thread; make_profiler() keeps it from recording the Tk thread
+        profiler = make_profiler() if profile else None
+        try:
+            if profiler:
+                profiler.enable()
+            self._run_module(mod, params, evt, script_id)
+        finally:
+            if profiler:
+                profiler.disable()
+                try:
+                    path = save_profile(script_id, profiler)
+                    minescript.echo(f"Profile saved: {os.path.relpath(path, BASE_DIR)}")
+                except OSError as e:
+                    minescript.echo(f"Failed to save profile: {e}")
+            self.mailbox.post(("launcher", "finish"), generation)
+
+    # --- PIPELINES ---
+    def toggle_pipeline(self, name):
+        pipeline_id = PIPELINE_PREFIX + name
+        if self.active_script_id == pipeline_id:
+            minescript.echo(f"Stopping pipeline {name}...")
+            self.stop_script()
+        elif self.is_busy() or self.active_script_id is not None:
+            minescript.echo("Another script is already running. Stop it first.")
+        else:
+            self.start_pipeline(name)
+
+    def plan_pipeline(self, name):
+        """Resolves a pipeline's steps to script metas. Raises ValueError."""
+        steps = CFG.get("pipelines", {}).get(name)
+        if not steps:
+            raise ValueError(f"Unknown or empty pipeline: {name!r}")
+        plan = []
+        for step in steps:
+            meta = self.find_script(step.get("script"))
+            if meta is None:
+                raise ValueError(f"Unknown script in {name}: {step.get('script')!r}")
+            # Step params override the script's saved params, which override defaults
+            values = dict(meta.get("params", {}))
+            values.update(step.get("params") or {})
+            plan.append({
+                "meta": meta,
+                "values": values,
+                "continue_on_error": bool(step.get("continue_on_error", False)),
+            })
+        return plan
+
+    def prepare_step(self, step):
+        """Validates params and imports (pins) the module for one step. Thread-safe."""
+        script_id = step["meta"]["id"]
+        self.residency.pin(script_id)
+        try:
+            params = compile_params(step["meta"]["config"])(**step["values"])
+            mod = self.residency.acquire(step["meta"])
+        except Exception:
+            self.residency.release(script_id)
+            raise
+        return mod, params
+
+    def _prefetch_step(self, step, future):
+        try:
+            future.set_result(self.prepare_step(step))
+        except Exception as e:
+            future.set_exception(e)
+
+    def start_pipeline(self, name):
+        try:
+            plan = self.plan_pipeline(name)
+            first = self.prepare_step(plan[0])
+        except Exception as e:
+            minescript.echo(f"Cannot start pipeline {name}: {e}")
+            return False
+
+        pipeline_id = PIPELINE_PREFIX + name
+        self.stop_event.clear()
+        self.active_script_id = pipeline_id
+        self.pipeline_status = ""
+        self.run_progress = None
+        self.run_status_text = ""
+        if self.visible:
+            self.refresh_ui()
+
+        self.run_generation += 1
+        self.running_thread = threading.Thread(
+            target=self._pipeline_worker,
+            args=(pipeline_id, plan, first, self.stop_event, self.run_generation),
+            daemon=True,
+        )
+        self.running_thread.start()
+        self.run_count += 1
+        self.run_started_at = time.monotonic()
+        self.publish_state("started")
+        return True
+
+    def _pipeline_step_changed(self, index, script_id):
+        self.run_progress = None
+        self.run_status_text = ""
+        self.update_progress_widgets()
+        self.publish_state("step", step=index, script=script_id)
+        if self.visible and self.view_mode == "PIPELINES":
+            self.render_pipelines()
+
+    def _pipeline_worker(self, pipeline_id, plan, first, evt, generation):
+        """Runs steps back to back, importing and validating the next one in the background."""
+        prepared = Future()
+        prepared.set_result(first)
+        try:
+            for i, step in enumerate(plan):
+                script_id = step["meta"]["id"]
+                upcoming = None
+                if i + 1 < len(plan):
+                    upcoming = Future()
+                    threading.Thread(
+                        target=self._prefetch_step,
+                        args=(plan[i + 1], upcoming),
+                        daemon=True,
+                    ).start()
+
+                try:
+                    mod, params = prepared.result()
+                except Exception as e:
+                    minescript.echo(f"Cannot start {script_id}: {e}")
+                    ok = False
+                else:
+                    self.pipeline_status = f"Step {i + 1}/{len(plan)}: {step['meta']['title']}"
+                    self.mailbox.post(("launcher", "step"), (generation, i, script_id))
+                    ok = self._run_module(mod, params, evt, script_id)
+                    self.residency.release(script_id)
+
+                if evt.is_set() or not (ok or step["continue_on_error"]):
+                    if upcoming is not None and upcoming.exception() is None:
+                        self.residency.release(plan[i + 1]["meta"]["id"])
+                    break
+                prepared = upcoming
         finally:
-            self.after(0, self._finish_run)
+            self.pipeline_status = ""
+            self.mailbox.post(("launcher", "finish"), generation)
 
     def _finish_run(self):
+        if self.active_script_id is not None:
+            self.residency.release(self.active_script_id)
+        if self.run_started_at is not None:
+            self.last_run_seconds = time.monotonic() - self.run_started_at
+            self.run_started_at = None
+        finished_id = self.active_script_id
         self.active_script_id = None
+        self.profiling_script_id = None
+        self.run_progress = None
+        self.run_status_text = ""
+        self.lbl_status.configure(text="Ready", text_color=COLOR_TEXT_DIM)
+        self.publish_state("finished", script=finished_id)
         if self.visible and self.view_mode == "CONFIG":
             self.render_config()
         elif self.visible and self.view_mode == "HOME":
             self.render_home()
         elif self.visible and self.view_mode == "BROWSER":
             self.render_browser()
+        elif self.visible and self.view_mode == "PIPELINES":
+            self.render_pipelines()
 
     def stop_script(self):
         self.stop_event.set()
+        self.publish_state("stopping")
+
+    # --- CONTROL API ---
+    def find_script(self, script_id):
+        for scripts in self.script_tree.values():
+            for s in scripts:
+                if s["id"] == script_id:
+                    return s
+        return None
+
+    def is_busy(self):
+        return self.running_thread is not None and self.running_thread.is_alive()
+
+    def publish_state(self, event, **extra):
+        if self.control:
+            msg = {"event": event, "status": self.control_status()}
+            msg.update(extra)
+            self.control.publish(msg)
+
+    def control_status(self):
+        return {
+            "active": self.active_script_id,
+            "running": self.is_busy(),
+            "visible": self.visible,
+            "view": self.view_mode,
+            "pipeline_step": self.pipeline_status or None,
+            "progress": self.run_progress,
+            "status_text": self.run_status_text or None,
+        }
+
+    def control_metrics(self):
+        resident_count, resident_bytes = self.residency.stats()
+        elapsed = None
+        if self.run_started_at is not None:
+            elapsed = time.monotonic() - self.run_started_at
+        metrics = {
+            "runs": self.run_count,
+            "current_run_seconds": elapsed,
+            "last_run_seconds": self.last_run_seconds,
+            "resident_modules": resident_count,
+            "resident_kb": round(resident_bytes / 1024, 1),
+            "clients": self.control.client_count() if self.control else 0,
+        }
+        if self.watchdog:
+            stalls = self.watchdog.recent()
+            metrics["stalls"] = self.watchdog.count
+            metrics["last_stall_ms"] = round(stalls[-1]["duration"] * 1000) if stalls else None
+        if self.memory.enabled:
+            metrics["memory_growing"] = self.memory.flagged()
+        if self.governor:
+            rate, sent, active = self.governor.stats()
+            metrics["command_rate_limit"] = round(rate, 1)
+            metrics["commands_per_second"] = sent
+            metrics["command_backoffs"] = self.governor.backoffs
+            metrics["command_active_scripts"] = active
+        return metrics
+
+    def control_list(self):
+        result = []
+        for cat in self.categories:
+            for s in self.script_tree.get(cat, []):
+                result.append({
+                    "id": s["id"],
+                    "title": s["title"],
+                    "category": cat,
+                    "description": s["desc"],
+                    "running": s["id"] == self.active_script_id,
+                    "controls": s["config"].get("controls", {}),
+                    "params": s.get("params", {}),
+                })
+        return result
+
+    def prepare_control_command(self, request, pending_start=False):
+        """Validates one command and returns a callable that applies it.
+
+        Raises ValueError without side effects, so a batch can be checked
+        completely before any of it runs.
+        """
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return lambda: "pong"
+        if cmd == "list":
+            return self.control_list
+        if cmd == "status":
+            return self.control_status
+        if cmd == "metrics":
+            return self.control_metrics
+        if cmd == "stop":
+            return lambda: self.stop_script() or self.control_status()
+        if cmd == "start":
+            meta = self.find_script(request.get("script"))
+            if meta is None:
+                raise ValueError(f"Unknown script: {request.get('script')!r}")
+            if self.is_busy() or self.active_script_id is not None or pending_start:
+                raise ValueError("Another script is already running. Stop it first.")
+            values = dict(meta.get("params", {}))
+            values.update(request.get("params") or {})
+            compile_params(meta["config"])(**values)
+            try:
+                self.residency.acquire(meta)  # Import errors fail validation, not apply
+            except Exception as e:
+                raise ValueError(f"Failed to load {meta['id']}: {e}") from None
+
+            def apply():
+                self.current_script_meta = meta
+                if not self.start_script_thread(values, meta["id"]):
+                    raise ValueError(f"Failed to start {meta['id']}")
+                return self.control_status()
+            return apply
+        if cmd == "run_pipeline":
+            name = request.get("name")
+            self.plan_pipeline(name)
+            if self.is_busy() or self.active_script_id is not None or pending_start:
+                raise ValueError("Another script is already running. Stop it first.")
+
+            def apply():
+                if not self.start_pipeline(name):
+                    raise ValueError(f"Failed to start pipeline {name}")
+                return self.control_status()
+            return apply
+        raise ValueError(f"Unknown command: {cmd!r}")
+
+    def handle_control_request(self, request):
+        """Runs on the Tk thread. A batch is validated as a whole, then applied in one go."""
+        if request.get("cmd") != "batch":
+            return self.prepare_control_command(request)()
+
+        commands = request.get("commands")
+        if not isinstance(commands, list):
+            raise ValueError("batch needs a 'commands' list")
+        actions = []
+        pending_start = False
+        for i, sub in enumerate(commands):
+            if not isinstance(sub, dict) or sub.get("cmd") in ("batch", "subscribe"):
+                raise ValueError(f"Command {i} is not allowed in a batch")
+            try:
+                actions.append(self.prepare_control_command(sub, pending_start))
+            except ValueError as e:
+                raise ValueError(f"Command {i}: {e}") from None
+            pending_start = pending_start or sub.get("cmd") in ("start", "run_pipeline")
+        results = []
+        for i, action in enumerate(actions):
+            try:
+                results.append(action())
+            except Exception as e:
+                raise ValueError(
+                    f"Command {i} failed after {i} command(s) were applied: {e}"
+                ) from None
+        return results
 
 
 if __name__ == "__main__":
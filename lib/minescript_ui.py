@@ -1,3 +1,8 @@
+import threading
+import collections
+import collections.abc
+import time
+
 class ScriptUI:
     def __init__(self, title, category="Uncategorized", description=""):
         self.data = {
@@ -59,3 +64,387 @@ class ScriptUI:
     def export(self):
         """Returns the dictionary required by the GUI Launcher."""
         return self.data
+
+    def compile(self):
+        """Returns the generated Params class for this UI (see compile_params)."""
+        return compile_params(self.data)
+
+
+class Params(collections.abc.Mapping):
+    """Base class for the parameter objects passed to a script's run().
+
+    Subclasses are generated by compile_params() with one slot per control,
+    so scripts can use params.delay instead of params['delay']. They are also
+    mappings (params['delay'], dict(params), **params, items(), ...), and item
+    assignment re-validates the value, so scripts written for the old dict
+    params keep working.
+
+    Controls whose id can't be an attribute (not an identifier, starts with
+    "_", or clashes with a mapping method such as keys/items/get) are only
+    reachable by item access, e.g. params['items'].
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _item_only = frozenset()  # Fields kept in the _extra dict instead of a slot
+    _defaults = {}
+    _validators = {}
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self._fields)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+        self._extra = {}
+        for name in self._fields:
+            value = values[name] if name in values else self._defaults[name]
+            self._store(name, self._validators[name](value))
+
+    def _store(self, key, value):
+        if key in self._item_only:
+            self._extra[key] = value
+        else:
+            setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        if key in self._item_only:
+            return self._extra[key]
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._fields:
+            raise KeyError(key)
+        self._store(key, self._validators[key](value))
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def get(self, key, default=None):
+        return self[key] if key in self._fields else default
+
+    def as_dict(self):
+        return {name: self[name] for name in self._fields}
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{type(self).__name__}({args})"
+
+
+def _number_validator(name, cast, lo, hi):
+    def validate(value):
+        if isinstance(value, bool):
+            raise ValueError(f"{name}: expected a number, got {value!r}")
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: expected a number, got {value!r}") from None
+        number = cast(round(number)) if cast is int else cast(number)
+        if lo is not None and number < lo or hi is not None and number > hi:
+            raise ValueError(f"{name}: {number} is outside [{lo}, {hi}]")
+        return number
+    return validate
+
+
+def _bool_validator(name):
+    def validate(value):
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in ("1", "true", "yes", "on"):
+                return True
+            if lowered in ("0", "false", "no", "off"):
+                return False
+        elif value in (0, 1):
+            return bool(value)
+        raise ValueError(f"{name}: expected a boolean, got {value!r}")
+    return validate
+
+
+def _choice_validator(name, options):
+    allowed = {str(o): o for o in options}
+
+    def validate(value):
+        if value in options:
+            return value
+        if str(value) in allowed:
+            return allowed[str(value)]
+        raise ValueError(f"{name}: {value!r} is not one of {list(options)}")
+    return validate
+
+
+def _make_validator(name, setting):
+    stype = setting.get("type", "string")
+    if stype == "int":
+        return _number_validator(name, int, setting.get("min"), setting.get("max"))
+    if stype == "float":
+        return _number_validator(name, float, setting.get("min"), setting.get("max"))
+    if stype == "bool":
+        return _bool_validator(name)
+    if stype == "dropdown":
+        return _choice_validator(name, setting.get("options", []))
+    return lambda value: value
+
+
+def compile_params(config):
+    """Builds (once) a slotted Params subclass for a UI_CONFIG dict.
+
+    Validators and defaults are cached on the class, and the class is cached on
+    the config under "_params_class". Raises ValueError if a default fails its
+    own constraints.
+    """
+    cached = config.get("_params_class")
+    if cached is not None:
+        return cached
+
+    controls = config.get("controls", {})
+    validators = {}
+    defaults = {}
+    for name, setting in controls.items():
+        validators[name] = _make_validator(name, setting)
+        defaults[name] = validators[name](setting.get("default"))
+
+    item_only = frozenset(
+        name for name in controls
+        if not name.isidentifier() or name.startswith("_") or hasattr(Params, name)
+    )
+
+    cls_name = "".join(
+        part.capitalize() for part in str(config.get("title", "")).split() if part.isalnum()
+    )
+    cls = type(Params)(
+        (cls_name or "Script") + "Params",
+        (Params,),
+        {
+            "__slots__": tuple(n for n in controls if n not in item_only) + ("_extra",),
+            "_fields": tuple(controls),
+            "_item_only": item_only,
+            "_defaults": defaults,
+            "_validators": validators,
+        },
+    )
+    config["_params_class"] = cls
+    return cls
+
+
+
+# --- RUNTIME HOOKS (installed by the GUI Launcher) ---
+_context = threading.local()
+_active_run = None  # Script id of the launcher's current run, for threads it starts
+_event_bus = None
+_mailbox = None
+
+
+def current_script():
+    """Returns the id of the script this code runs for, if started by the launcher.
+
+    Threads a script starts itself are credited to the launcher's current run.
+    The main (Tk) thread never is.
+    """
+    script_id = getattr(_context, "script_id", None)
+    if script_id is None and threading.current_thread() is not threading.main_thread():
+        return _active_run
+    return script_id
+
+
+def _set_current_script(script_id):
+    """Marks the start (or, with None, the end) of a run on the calling thread."""
+    global _active_run
+    _context.script_id = script_id
+    _active_run = script_id
+
+
+def install_event_bus(bus):
+    global _event_bus
+    _event_bus = bus
+
+
+def install_mailbox(mailbox):
+    global _mailbox
+    _mailbox = mailbox
+
+
+class Mailbox:
+    """Thread-safe, coalescing channel from any thread to the UI thread.
+
+    Only the latest value per key is kept, so a thread posting in a tight
+    loop costs the UI one update per drain, not one per post.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latest = {}
+
+    def post(self, key, value):
+        with self.lock:
+            self.latest[key] = value
+
+    def drain(self):
+        """Returns {key: latest value} posted since the last drain, in first-posted order."""
+        with self.lock:
+            items, self.latest = self.latest, {}
+            return items
+
+
+class Subscription:
+    """A bounded per-script queue of game events.
+
+    When full, "drop_oldest" discards the oldest queued event and "drop_newest"
+    discards the incoming one. `dropped` counts discarded events.
+    """
+
+    POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, event_type, maxsize=256, policy="drop_oldest", owner=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown drop policy: {policy!r}")
+        self.event_type = event_type
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.owner = owner
+        self.dropped = 0
+        self.closed = False
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+
+    def put(self, event):
+        with self._cond:
+            if self.closed:
+                return
+            if len(self._items) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == "drop_newest":
+                    return
+                self._items.popleft()
+            self._items.append(event)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Waits for the next event. Returns None on timeout or once closed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._items and not self.closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._items.popleft() if self._items else None
+
+    def drain(self):
+        """Returns every queued event without waiting."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if _event_bus is not None:
+            _event_bus.unsubscribe(self)
+
+    def __iter__(self):
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+
+class EventBus:
+    """Fans game events out to script subscriptions.
+
+    The launcher owns the single minescript EventQueue; each listener type is
+    registered on it once, the first time any script subscribes to it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}  # { event_type: [Subscription] }
+        self.requested = set()
+        self.registered = set()
+        self.keys_down = set()
+
+    def subscribe(self, event_type, maxsize=256, policy="drop_oldest", owner=None):
+        sub = Subscription(event_type, maxsize, policy, owner)
+        with self.lock:
+            self.subscribers.setdefault(event_type, []).append(sub)
+            if event_type not in self.registered:
+                self.requested.add(event_type)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self.lock:
+            subs = self.subscribers.get(sub.event_type, [])
+            if sub in subs:
+                subs.remove(sub)
+
+    def unsubscribe_owner(self, owner):
+        """Closes every subscription made by a script. Called when it stops."""
+        with self.lock:
+            owned = [
+                sub
+                for subs in self.subscribers.values()
+                for sub in subs
+                if sub.owner == owner
+            ]
+        for sub in owned:
+            sub.close()
+
+    def take_requested(self):
+        """Returns listener types that still need registering, marking them registered."""
+        with self.lock:
+            new = self.requested - self.registered
+            self.registered |= new
+            self.requested.clear()
+            return new
+
+    def has_subscribers(self, event_type):
+        with self.lock:
+            return bool(self.subscribers.get(event_type))
+
+    def publish(self, event_type, event):
+        with self.lock:
+            targets = list(self.subscribers.get(event_type, ()))
+        for sub in targets:
+            sub.put(event)
+
+
+def subscribe(event_type, maxsize=256, policy="drop_oldest"):
+    """Subscribes the running script to game events ("key", "chat", "tick", ...).
+
+    Subscriptions are closed automatically when the script stops.
+    """
+    if _event_bus is None:
+        raise RuntimeError("Event subscriptions need the BlockyTK launcher.")
+    return _event_bus.subscribe(event_type, maxsize, policy, owner=current_script())
+
+
+def is_key_down(key_code):
+    """Returns True while the given (GLFW) key is held, as seen by the launcher."""
+    return _event_bus is not None and key_code in _event_bus.keys_down
+
+
+def progress(fraction, text=None):
+    """Reports the running script's progress (0.0 - 1.0) to the launcher.
+
+    Cheap to call often: updates are coalesced and the overlay only shows the
+    latest one. Does nothing when the script runs without the launcher.
+    """
+    if _mailbox is None:
+        return
+    _mailbox.post((current_script(), "progress"), min(1.0, max(0.0, float(fraction))))
+    if text is not None:
+        status(text)
+
+
+def status(text):
+    """Shows a short status line for the running script in the launcher."""
+    if _mailbox is not None:
+        _mailbox.post((current_script(), "status"), str(text)[:200])
@@ -0,0 +1,482 @@
+"""Offline Minescript simulator and script benchmark runner.
+
+Runs a BlockyTK script's run() against an in-memory block world instead of
+the game. Usage:
+
+    python minescript_sim.py bridge --duration 5 --latency 0.002 --param material=stone
+    python minescript_sim.py bridge --ground-y -10 --expect "3 -1 0 stone"
+"""
+import sys
+import os
+import time
+import math
+import threading
+import importlib
+import argparse
+import collections
+import types
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BASE_DIR, "lib")
+if os.path.exists(LIB_DIR) and LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+import minescript_ui
+
+FILL_LIMIT = 32768  # Same cap as vanilla /fill
+WALK_SPEED = 4.317  # Blocks per second
+TICK_INTERVAL = 0.05
+
+
+def normalize_block(block):
+    """'minecraft:stone' -> 'stone'. Block states ([...]) are kept."""
+    return block[len("minecraft:"):] if block.startswith("minecraft:") else block
+
+
+class SimWorld:
+    """Sparse block world: a flat floor of `ground` at y <= ground_y, air above,
+    plus whatever has been placed."""
+
+    def __init__(self, ground="stone", ground_y=-1):
+        self.ground = ground
+        self.ground_y = ground_y
+        self.blocks = {}  # { (x, y, z): block }, only cells that differ from the default
+        self.lock = threading.Lock()
+
+    def default_block(self, y):
+        return self.ground if y <= self.ground_y else "air"
+
+    def get(self, x, y, z):
+        with self.lock:
+            return self.blocks.get((x, y, z), self.default_block(y))
+
+    def set(self, x, y, z, block):
+        """Sets a block. Returns False if it already was that block."""
+        block = normalize_block(block)
+        with self.lock:
+            current = self.blocks.get((x, y, z), self.default_block(y))
+            if current == block:
+                return False
+            if block == self.default_block(y):
+                del self.blocks[(x, y, z)]
+            else:
+                self.blocks[(x, y, z)] = block
+            return True
+
+
+class SimPlayer:
+    """A player moving in a straight line at constant velocity from `start`."""
+
+    def __init__(self, start=(0.5, 0.0, 0.5), velocity=(WALK_SPEED, 0.0, 0.0)):
+        self.start = list(start)
+        self.velocity = list(velocity)
+        self.t0 = time.monotonic()
+        self.lock = threading.Lock()
+
+    def position(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.t0
+            return [p + v * elapsed for p, v in zip(self.start, self.velocity)]
+
+    def teleport(self, x, y, z):
+        with self.lock:
+            self.start = [x, y, z]
+            self.t0 = time.monotonic()
+
+
+class CommandError(ValueError):
+    pass
+
+
+class SimEventQueue:
+    """minescript.EventQueue stand-in. Receives the simulator's events of the registered types."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.types = set()
+        self.queue = collections.deque()
+        sim.queues.append(self)
+
+    def _register(self, event_type):
+        self.types.add(event_type)
+        self.sim.listeners.add(event_type)
+
+    def get(self, block=True, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.queue:
+            if not block or (deadline is not None and time.monotonic() >= deadline):
+                return None
+            time.sleep(0.005)
+        return self.queue.popleft()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.sim.queues.remove(self)
+        return False
+
+
+EVENT_TYPES = (
+    "key", "mouse", "chat", "outgoing_chat", "add_entity", "block_update",
+    "take_item", "damage", "explosion", "chunk", "world",
+)
+for _event_type in EVENT_TYPES:
+    setattr(
+        SimEventQueue,
+        f"register_{_event_type}_listener",
+        lambda self, _t=_event_type: self._register(_t),
+    )
+
+
+class SimMinescript:
+    """Stand-in for the minescript module backed by SimWorld/SimPlayer.
+
+    Every call sleeps for `latency` seconds to mimic the round trip to the game.
+    """
+
+    class EventType:
+        KEY = "key"
+        MOUSE = "mouse"
+        CHAT = "chat"
+        OUTGOING_CHAT = "outgoing_chat"
+        ADD_ENTITY = "add_entity"
+        BLOCK_UPDATE = "block_update"
+        TAKE_ITEM = "take_item"
+        DAMAGE = "damage"
+        EXPLOSION = "explosion"
+        CHUNK = "chunk"
+        WORLD = "world"
+
+    def __init__(self, world=None, player=None, latency=0.0, quiet=False):
+        self.world = world or SimWorld()
+        self.player = player or SimPlayer()
+        self.latency = latency
+        self.quiet = quiet
+        self.stats = collections.Counter()  # commands, errors, unhandled, changed
+        self.error_log = collections.deque(maxlen=20)
+        self.queues = []
+        self.listeners = set()
+
+    def EventQueue(self):
+        return SimEventQueue(self)
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    # --- minescript API ---
+    def echo(self, *messages):
+        if not self.quiet:
+            print(f"[MINESCRIPT] {' '.join(str(m) for m in messages)}")
+
+    def chat(self, *messages):
+        self.echo(*messages)
+
+    def log(self, *messages):
+        self.echo(*messages)
+
+    def screen_name(self):
+        return None
+
+    def player_name(self):
+        return "Simulated"
+
+    def player_position(self):
+        self._wait()
+        return self.player.position()
+
+    def getblock(self, x, y, z):
+        self._wait()
+        return "minecraft:" + self.world.get(int(x), int(y), int(z))
+
+    def execute(self, command):
+        self._wait()
+        self.stats["commands"] += 1
+        try:
+            self.apply(command)
+        except CommandError as e:
+            self.stats["errors"] += 1
+            self.error_log.append(f"{command}: {e}")
+
+    # --- synthetic events ---
+    def emit(self, event_type, **fields):
+        event = types.SimpleNamespace(type=event_type, time=time.time(), **fields)
+        for queue in list(self.queues):
+            if event_type in queue.types:
+                queue.queue.append(event)
+
+    def press_key(self, key, action=1):
+        self.emit(self.EventType.KEY, key=key, scan_code=0, action=action, modifiers=0, screen=None)
+
+    # --- command parsing ---
+    def _coord(self, token, base):
+        if token.startswith("~"):
+            return math.floor(base + (float(token[1:]) if len(token) > 1 else 0.0))
+        if token.startswith("^"):
+            raise CommandError("local (^) coordinates are not supported")
+        try:
+            return math.floor(float(token))
+        except ValueError:
+            raise CommandError(f"bad coordinate {token!r}") from None
+
+    def _coords(self, tokens):
+        if len(tokens) != 3:
+            raise CommandError("expected 3 coordinates")
+        return [self._coord(t, p) for t, p in zip(tokens, self.player.position())]
+
+    def apply(self, command):
+        parts = command.strip().lstrip("/").split()
+        if not parts:
+            raise CommandError("empty command")
+        name, args = parts[0], parts[1:]
+
+        if name == "setblock":
+            if len(args) < 4:
+                raise CommandError("usage: setblock x y z block [replace|keep|destroy]")
+            x, y, z = self._coords(args[:3])
+            mode = args[4] if len(args) > 4 else "replace"
+            if mode not in ("replace", "keep", "destroy"):
+                raise CommandError(f"bad mode {mode!r}")
+            if mode == "keep" and self.world.get(x, y, z) != "air":
+                return
+            if self.world.set(x, y, z, args[3]):
+                self.stats["changed"] += 1
+                self._block_update(x, y, z)
+        elif name == "fill":
+            self._fill(args)
+        elif name in ("tp", "teleport"):
+            coords = [a for a in args if not a.startswith("@")]
+            x, y, z = self._coords(coords[:3])
+            self.player.teleport(x + 0.5, y, z + 0.5)
+        else:
+            self.stats["unhandled"] += 1
+
+    def _fill(self, args):
+        if len(args) < 7:
+            raise CommandError("usage: fill x1 y1 z1 x2 y2 z2 block [mode]")
+        x1, y1, z1 = self._coords(args[0:3])
+        x2, y2, z2 = self._coords(args[3:6])
+        block = args[6]
+        mode = args[7] if len(args) > 7 else "replace"
+        filter_block = normalize_block(args[8]) if mode == "replace" and len(args) > 8 else None
+        if mode not in ("replace", "keep", "destroy", "hollow", "outline"):
+            raise CommandError(f"bad mode {mode!r}")
+
+        xs = range(min(x1, x2), max(x1, x2) + 1)
+        ys = range(min(y1, y2), max(y1, y2) + 1)
+        zs = range(min(z1, z2), max(z1, z2) + 1)
+        if len(xs) * len(ys) * len(zs) > FILL_LIMIT:
+            raise CommandError(f"too many blocks (max {FILL_LIMIT})")
+
+        for x in xs:
+            for y in ys:
+                for z in zs:
+                    edge = x in (xs[0], xs[-1]) or y in (ys[0], ys[-1]) or z in (zs[0], zs[-1])
+                    target = block
+                    if mode in ("hollow", "outline") and not edge:
+                        if mode == "outline":
+                            continue
+                        target = "air"
+                    current = self.world.get(x, y, z)
+                    if mode == "keep" and current != "air":
+                        continue
+                    if filter_block is not None and current != filter_block:
+                        continue
+                    if self.world.set(x, y, z, target):
+                        self.stats["changed"] += 1
+                        self._block_update(x, y, z)
+
+    def _block_update(self, x, y, z):
+        if self.EventType.BLOCK_UPDATE in self.listeners:
+            self.emit(
+                self.EventType.BLOCK_UPDATE,
+                position=[x, y, z],
+                old_state=None,
+                new_state="minecraft:" + self.world.get(x, y, z),
+            )
+
+
+# --- RUNNER ---
+def parse_expectation(text):
+    """'x y z block' -> ((x, y, z), block)"""
+    parts = text.split()
+    if len(parts) != 4:
+        raise ValueError(f"Expected 'x y z block', got {text!r}")
+    return tuple(int(p) for p in parts[:3]), normalize_block(parts[3])
+
+
+def run_script(
+    script_id,
+    params=None,
+    duration=5.0,
+    latency=0.0,
+    scripts_dir=None,
+    expect=(),
+    key_events=(),
+    sim=None,
+):
+    """Runs a script's run() against the simulator and returns a report dict.
+
+    `expect` is a list of ((x, y, z), block) the world must contain afterwards.
+    A script may also define sim_check(world, params) returning (ok, message).
+    `key_events` is a list of (seconds_after_start, key_code) presses.
+    """
+    sim = sim or SimMinescript(latency=latency)
+    sys.modules["minescript"] = sim
+
+    scripts_dir = scripts_dir or os.path.join(BASE_DIR, "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    if script_id in sys.modules:
+        mod = importlib.reload(sys.modules[script_id])
+    else:
+        mod = importlib.import_module(script_id)
+    if not hasattr(mod, "run"):
+        raise ValueError(f"{script_id} has no run(params, stop_event)")
+
+    config = getattr(mod, "UI_CONFIG", {"controls": {}})
+    run_params = minescript_ui.compile_params(config)(**(params or {}))
+
+    # Scripts may subscribe to events; feed them the simulator's events and ticks
+    bus = minescript_ui.EventBus()
+    minescript_ui.install_event_bus(bus)
+    queue = sim.EventQueue()
+    queue.register_key_listener()
+
+    stop_event = threading.Event()
+    outcome = {}
+
+    def worker():
+        minescript_ui._set_current_script(script_id)
+        try:
+            mod.run(run_params, stop_event)
+        except Exception as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            minescript_ui._set_current_script(None)
+            bus.unsubscribe_owner(script_id)
+
+    pending_keys = sorted(key_events)
+    start = time.monotonic()
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+
+    last_tick = start
+    while thread.is_alive():
+        now = time.monotonic()
+        if now - start >= duration:
+            stop_event.set()
+            thread.join(timeout=2.0)
+            break
+        while pending_keys and now - start >= pending_keys[0][0]:
+            sim.press_key(pending_keys.pop(0)[1])
+        for event_type in bus.take_requested():
+            register = getattr(queue, f"register_{event_type}_listener", None)
+            if register:
+                register()
+        while True:
+            event = queue.get(block=False)
+            if event is None:
+                break
+            bus.publish(str(event.type), event)
+        if now - last_tick >= TICK_INTERVAL:
+            last_tick = now
+            bus.publish("tick", types.SimpleNamespace(type="tick", time=time.time()))
+        time.sleep(0.005)
+    elapsed = time.monotonic() - start
+
+    failures = [
+        f"{pos}: expected {block}, found {sim.world.get(*pos)}"
+        for pos, block in expect
+        if sim.world.get(*pos) != block
+    ]
+    check_message = None
+    if hasattr(mod, "sim_check"):
+        ok, check_message = mod.sim_check(sim.world, run_params)
+        if not ok:
+            failures.append(check_message)
+
+    commands = sim.stats["commands"]
+    return {
+        "script": script_id,
+        "elapsed": elapsed,
+        "finished": not thread.is_alive(),
+        "error": outcome.get("error"),
+        "commands": commands,
+        "commands_per_second": commands / elapsed if elapsed else 0.0,
+        "command_errors": sim.stats["errors"],
+        "error_log": list(sim.error_log),
+        "unhandled_commands": sim.stats["unhandled"],
+        "blocks_changed": sim.stats["changed"],
+        "correct": None if not (expect or hasattr(mod, "sim_check")) else not failures,
+        "failures": failures,
+        "check_message": check_message,
+    }
+
+
+def print_report(report):
+    print(f"Script:            {report['script']}")
+    print(f"Elapsed:           {report['elapsed']:.2f} s" + ("" if report["finished"] else " (did not stop)"))
+    print(f"Commands:          {report['commands']} ({report['commands_per_second']:.1f}/s)")
+    print(f"Blocks changed:    {report['blocks_changed']}")
+    print(f"Command errors:    {report['command_errors']}")
+    for line in report["error_log"]:
+        print(f"    {line}")
+    print(f"Unhandled:         {report['unhandled_commands']}")
+    if report["error"]:
+        print(f"Script error:      {report['error']}")
+    if report["correct"] is None:
+        print("End state:         not checked (use --expect or define sim_check)")
+    else:
+        print(f"End state:         {'OK' if report['correct'] else 'FAILED'}")
+        for failure in report["failures"]:
+            print(f"    {failure}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a BlockyTK script against the offline simulator.")
+    parser.add_argument("script", help="Script module name in the scripts folder (e.g. bridge)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds before stop_event is set")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API call")
+    parser.add_argument("--param", action="append", default=[], help="key=value, repeatable")
+    parser.add_argument("--expect", action="append", default=[], help="'x y z block' that must hold at the end")
+    parser.add_argument("--key", action="append", default=[], help="'seconds key_code' synthetic key press")
+    parser.add_argument("--ground", default="stone", help="Block the world's floor is made of")
+    parser.add_argument("--ground-y", type=int, default=-1, help="Top of the floor; everything above is air")
+    parser.add_argument("--scripts-dir", default=None)
+    parser.add_argument("--quiet", action="store_true", help="Hide the script's echo output")
+    args = parser.parse_args(argv)
+
+    bad = [p for p in args.param if "=" not in p]
+    if bad:
+        parser.error(f"--param {bad[0]!r}: expected key=value")
+    params = dict(p.split("=", 1) for p in args.param)
+    try:
+        key_events = [(float(t), int(k)) for t, k in (s.split() for s in args.key)]
+    except ValueError:
+        parser.error("--key: expected 'seconds key_code', e.g. --key '1.5 32'")
+    try:
+        expect = [parse_expectation(e) for e in args.expect]
+    except ValueError as e:
+        parser.error(f"--expect: {e}")
+
+    world = SimWorld(ground=normalize_block(args.ground), ground_y=args.ground_y)
+    try:
+        report = run_script(
+            args.script,
+            params=params,
+            duration=args.duration,
+            scripts_dir=args.scripts_dir,
+            expect=expect,
+            key_events=key_events,
+            sim=SimMinescript(world=world, latency=args.latency, quiet=args.quiet),
+        )
+    except ValueError as e:  # Invalid --param values or no run()
+        parser.error(f"{args.script}: {e}")
+    print_report(report)
+    return 0 if report["correct"] is not False and not report["error"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())